@@ -0,0 +1,62 @@
+from unittest import TestCase
+
+from video_display.frame_cache import FrameCache
+
+from PyQt5.QtGui import QImage
+
+
+def create_frame():
+    return QImage(10, 10, QImage.Format_RGB32)  # 400 bytes
+
+
+FRAME_SIZE = create_frame().sizeInBytes()
+
+
+class TestFrameCache(TestCase):
+    def setUp(self):
+        self.frame_cache = FrameCache(3 * FRAME_SIZE)
+        self.frames = [create_frame() for _ in range(4)]
+
+    def test_get(self):
+        self.frame_cache.put(5, self.frames[0])
+
+        self.assertIs(self.frames[0], self.frame_cache.get(5))
+        self.assertIsNone(self.frame_cache.get(6))
+
+        self.assertEqual(1, self.frame_cache.get_hit_count())
+        self.assertEqual(1, self.frame_cache.get_miss_count())
+        self.assertEqual(FRAME_SIZE, self.frame_cache.get_memory_used())
+
+    def test_least_recently_used_evicted(self):
+        for frame_number in range(3):
+            self.frame_cache.put(frame_number, self.frames[frame_number])
+
+        self.frame_cache.get(0)  # 1 is now the least recently used
+        self.frame_cache.put(3, self.frames[3])
+
+        self.assertNotIn(1, self.frame_cache)
+        for frame_number in (0, 2, 3):
+            self.assertIn(frame_number, self.frame_cache)
+        self.assertEqual(3 * FRAME_SIZE, self.frame_cache.get_memory_used())
+
+    def test_replace(self):
+        self.frame_cache.put(0, self.frames[0])
+        self.frame_cache.put(0, self.frames[1])
+
+        self.assertEqual(1, len(self.frame_cache))
+        self.assertIs(self.frames[1], self.frame_cache.get(0))
+        self.assertEqual(FRAME_SIZE, self.frame_cache.get_memory_used())
+
+    def test_frame_too_big(self):
+        self.frame_cache.put(0, QImage(100, 100, QImage.Format_RGB32))
+
+        self.assertEqual(0, len(self.frame_cache))
+
+    def test_set_memory_budget(self):
+        for frame_number in range(3):
+            self.frame_cache.put(frame_number, self.frames[frame_number])
+
+        self.frame_cache.set_memory_budget(FRAME_SIZE)
+
+        self.assertEqual([2], [n for n in range(3) if n in self.frame_cache])
+        self.assertEqual(FRAME_SIZE, self.frame_cache.get_memory_used())
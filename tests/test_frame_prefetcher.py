@@ -0,0 +1,55 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from video_display.frame_prefetcher import FramePrefetcher
+
+
+class MockFrameCache:
+    def __init__(self, frame_numbers=()):
+        self._frame_numbers = set(frame_numbers)
+        self.put = MagicMock()
+
+    def __contains__(self, frame_number):
+        return frame_number in self._frame_numbers
+
+
+class TestFramePrefetcher(TestCase):
+    def setUp(self):
+        self.frame_cache = MockFrameCache([12])
+        self.prefetcher = FramePrefetcher(self.frame_cache, MagicMock(),
+                                          depth=3, memory_cap=1000)
+        self.prefetcher._frame_count = 100
+
+    def test_forwards(self):
+        self.assertEqual([11, 13], self.prefetcher.plan(10, 1))
+
+    def test_direction_and_step(self):
+        self.prefetcher.plan(50, 2)
+        self.assertEqual([44, 42, 40], self.prefetcher.plan(46, 2))
+
+        # Stepping forwards again
+        self.assertEqual([52, 54, 56], self.prefetcher.plan(50, 2))
+
+    def test_within_video(self):
+        self.assertEqual([98, 99], self.prefetcher.plan(97, 1))
+
+        self.prefetcher.plan(5, 1)
+        self.assertEqual([1, 0], self.prefetcher.plan(2, 1))
+
+    def test_memory_cap(self):
+        self.prefetcher._frame_size = 400
+
+        self.assertEqual([21, 22], self.prefetcher.plan(20, 1))
+
+    def test_untimestamped_frame(self):
+        self.prefetcher._frame_rate = 10.0
+        self.prefetcher._pending = 11
+        self.prefetcher._media_player = MagicMock()
+
+        frame = MagicMock()
+        frame.startTime.return_value = -1
+        self.prefetcher._frame_presented(frame)
+
+        self.frame_cache.put.assert_called_once_with(
+            11, self.prefetcher._copy_frame.return_value)
+        self.assertIsNone(self.prefetcher._pending)
@@ -0,0 +1,74 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from object_model.graph_series import GraphSeries, MIN_TAIL_LENGTH
+
+
+class MockPlotItem:
+    def __init__(self):
+        self.plot = MagicMock(side_effect=lambda **kwargs: MagicMock())
+        self.removeItem = MagicMock()
+
+
+class TestGraphSeries(TestCase):
+    def setUp(self):
+        self.series = GraphSeries(MockPlotItem())
+        self.curve = self.series._curve
+        self.tail = self.series._tail
+        self.joint = self.series._joint
+
+        self.x = np.arange(100, dtype=float)
+        self.y = self.x ** 2
+        self.series.plot(self.x, self.y)
+        self.curve.setData.reset_mock()
+
+    def test_missing_values_left_out(self):
+        self.y[[0, 50]] = np.nan
+        self.series.plot(self.x, self.y)
+
+        self.assertEqual(98, len(self.series))
+        self.assertNotIn(50, self.series.get_x())
+
+    def test_append_only_redraws_tail(self):
+        x = np.arange(1000, dtype=float)
+        for size in range(101, 200):
+            self.series.plot(x[:size], x[:size], size - 1)
+
+        self.curve.setData.assert_not_called()
+        self.assertEqual(x[:199].tolist(), self.series.get_x().tolist())
+        self.assertEqual(198, self.tail.setData.call_args[0][0][-1])
+
+    def test_tail_joined_to_curve(self):
+        self.series.plot(self.x, self.y)
+        self.series.update_symbols(0, 100, 1000)
+
+        curve_x = self.curve.setData.call_args[0][0].tolist()
+        tail_x = self.tail.setData.call_args[0][0].tolist()
+        joint_x = self.joint.setData.call_args[0][0].tolist()
+
+        # Each point's symbol is only drawn by one of the curves
+        self.assertEqual(self.x.tolist(), curve_x + tail_x)
+        self.assertEqual([curve_x[-1], tail_x[0]], joint_x)
+        self.tail.setSymbol.assert_called_with('o')
+        self.joint.setSymbol.assert_not_called()
+
+    def test_earlier_change_redraws(self):
+        self.y[10] = -1
+        self.series.plot(self.x, self.y, 10)
+
+        self.curve.setData.assert_called_once()
+        self.assertEqual(100 - MIN_TAIL_LENGTH,
+                         len(self.curve.setData.call_args[0][0]))
+        self.assertEqual(-1, self.series.get_y()[10])
+
+    def test_decimation_only_when_increasing(self):
+        self.curve.setDownsampling.assert_called_with(auto=True,
+                                                      method='peak')
+
+        self.series.plot(self.x[::-1].copy(), self.y)
+
+        self.curve.setDownsampling.assert_called_with(auto=False,
+                                                      method='peak')
+        self.curve.setClipToView.assert_called_with(False)
@@ -0,0 +1,88 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import os
+import tempfile
+
+from video_display.media_info_cache import MediaInfoCache, \
+    get_default_cache_file
+
+INFO = {'frame_count': 100, 'frame_rate': 25.0, 'duration': 4000.0}
+
+
+class TestMediaInfoCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.directory.name, 'cache',
+                                       'media_info.json')
+
+        self.video_file = os.path.join(self.directory.name, 'video.mp4')
+        with open(self.video_file, 'wb') as file:
+            file.write(b'video')
+
+        self.parse = MagicMock(return_value=dict(INFO))
+        self.cache = MediaInfoCache(self.parse, self.cache_file)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_parsed_once(self):
+        self.assertEqual(INFO, self.cache.get(self.video_file))
+        self.assertEqual(INFO, self.cache.get(self.video_file))
+
+        self.parse.assert_called_once_with(os.path.abspath(self.video_file))
+
+    def test_persistent(self):
+        self.cache.get(self.video_file)
+
+        parse = MagicMock()
+        self.assertEqual(INFO, MediaInfoCache(parse, self.cache_file).get(
+            self.video_file))
+        parse.assert_not_called()
+
+    def test_stale_entry(self):
+        self.cache.get(self.video_file)
+
+        with open(self.video_file, 'ab') as file:
+            file.write(b' changed')
+
+        self.cache.get(self.video_file)
+        self.assertEqual(2, self.parse.call_count)
+
+    def test_refresh_stale_entries(self):
+        self.cache.get(self.video_file)
+
+        with open(self.video_file, 'ab') as file:
+            file.write(b' changed')
+
+        cache = MediaInfoCache(self.parse, self.cache_file)
+        cache.refresh_stale_entries()
+        cache.wait_for_refresh()
+        self.assertEqual(2, self.parse.call_count)
+
+        # The entry was refreshed, so the video isn't parsed again
+        cache.get(self.video_file)
+        self.assertEqual(2, self.parse.call_count)
+
+    def test_missing_video_removed(self):
+        self.cache.get(self.video_file)
+        os.remove(self.video_file)
+
+        self.cache.refresh_stale_entries()
+        self.cache.wait_for_refresh()
+
+        self.assertEqual({}, MediaInfoCache(self.parse,
+                                            self.cache_file)._entries)
+
+    def test_unreadable_cache_file(self):
+        os.makedirs(os.path.dirname(self.cache_file))
+        with open(self.cache_file, 'w') as file:
+            file.write('not json')
+
+        cache = MediaInfoCache(self.parse, self.cache_file)
+        self.assertEqual(INFO, cache.get(self.video_file))
+
+    def test_default_cache_file(self):
+        directory, file_name = os.path.split(get_default_cache_file())
+        self.assertEqual(('video-tracker', 'media_info.json'),
+                         (os.path.basename(directory), file_name))
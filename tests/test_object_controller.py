@@ -0,0 +1,219 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import csv
+import os
+import tempfile
+
+import numpy as np
+
+from object_model.object_controller import ObjectController
+from object_model.update_scheduler import POINTS, POSITION
+
+
+class MockObjectView:
+    def __init__(self, *args):
+        self.object_added = MagicMock()
+        self.object_removed = MagicMock()
+        self.object_renamed = MagicMock()
+        self.points_changed = MagicMock()
+        self.update = MagicMock()
+        self.load = MagicMock()
+        self.dump = MagicMock(return_value={})
+
+
+class MockOverlayController(MockObjectView):
+    def __init__(self):
+        super().__init__()
+        self.get_origin_pos = MagicMock(return_value=(0, 0))
+        self.get_reference_angle = MagicMock(return_value=0)
+        self.get_ruler_length = MagicMock(return_value=(10, 1, 'm'))
+        self.get_calibration_version = MagicMock(return_value=0)
+        self.position_changed = MagicMock()
+
+
+class MockVideoController:
+    def __init__(self):
+        self.get_times = MagicMock(
+            side_effect=lambda frames: np.asarray(frames) / 10)
+        self.get_current_position = MagicMock(return_value=2)
+        self.get_calibration_version = MagicMock(return_value=0)
+
+
+class MockUpdateScheduler:
+    def __init__(self, flush):
+        self.invalidate = MagicMock()
+        self.flush = MagicMock()
+
+
+def create_test_controller():
+    return ObjectController(MockOverlayController(), MockVideoController(),
+                            MockUpdateScheduler, MockObjectView,
+                            MockObjectView)
+
+
+class TestObjectController(TestCase):
+    def setUp(self):
+        self.controller = create_test_controller()
+
+        # Object #1 has points at frames 0, 2 and 4, and Object #2 at frames
+        # 1, 2 and 3 (10 px is 1 m, and y is up)
+        first = self.controller.create_object()
+        for frame in (0, 2, 4):
+            first.add_point(10 * frame, 0, frame)
+
+        second = self.controller.create_object()
+        for frame in (1, 2, 3):
+            second.add_point(0, -10 * frame, frame)
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, 'export.csv')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_rows(self):
+        with open(self.file_name, newline='') as f:
+            return list(csv.reader(f))
+
+
+class TestObjects(TestObjectController):
+    def test_create_after_rename(self):
+        self.controller.rename_object('Object #2', 'Object #3')
+
+        self.assertEqual('Object #4',
+                         self.controller.create_object().get_name())
+        self.assertEqual('Object #5',
+                         self.controller.create_object().get_name())
+
+
+class TestUpdates(TestObjectController):
+    def test_track_and_increment_redraws_once(self):
+        overlay_controller = self.controller._overlay_controller
+        update_scheduler = self.controller._update_scheduler
+        overlay_controller.position_changed.reset_mock()
+
+        self.controller.track_current_object(0, 0)
+        self.controller.position_changed()
+
+        overlay_controller.position_changed.assert_not_called()
+        update_scheduler.invalidate.assert_any_call(POINTS, throttle=False)
+        update_scheduler.invalidate.assert_called_with(POSITION,
+                                                       throttle=False)
+
+        self.controller._flush_updates({POINTS, POSITION})
+
+        overlay_controller.position_changed.assert_called_once_with()
+
+
+class TestTrailWindow(TestObjectController):
+    def get_frames_displayed(self):
+        return {points['name']: sorted(points['points'])
+                for points in self.controller.get_points_to_display()}
+
+    def test_points_in_window(self):
+        self.controller.set_trail_window(1, 0)
+
+        self.assertEqual({'Object #1': [2], 'Object #2': [1, 2]},
+                         self.get_frames_displayed())
+
+        self.controller.set_trail_window(0, 2)
+
+        self.assertEqual({'Object #1': [2, 4], 'Object #2': [2, 3]},
+                         self.get_frames_displayed())
+
+    def test_set_trail_window_redraws(self):
+        overlay_controller = self.controller._overlay_controller
+        overlay_controller.position_changed.reset_mock()
+
+        self.controller.set_trail_window(3, 4)
+
+        overlay_controller.position_changed.assert_called_once_with()
+        self.assertEqual((3, 4), self.controller.get_trail_window())
+
+    def test_trail_window_saved(self):
+        self.controller.set_trail_window(3, 4)
+
+        controller = create_test_controller()
+        controller.load(self.controller.dump())
+
+        self.assertEqual((3, 4), controller.get_trail_window())
+
+
+class TestExport(TestObjectController):
+    def test_join_objects(self):
+        self.assertTrue(self.controller.export_to_file(
+            [('Object #1', 'frame'), ('Object #1', 'x'),
+             ('Object #2', 'y')], self.file_name, 'csv'))
+
+        self.assertEqual([
+            ['frame (Object #1)', 'x (Object #1) [m]', 'y (Object #2) [m]'],
+            ['0', '0.0', ''],
+            ['', '', '1.0'],
+            ['2', '2.0', '2.0'],
+            ['', '', '3.0'],
+            ['4', '4.0', ''],
+        ], self.read_rows())
+
+    def test_disjoint_frames(self):
+        self.controller.get_current_object().remove_point(2)
+
+        self.controller.export_to_file(
+            [('Object #2', 'frame'), ('Object #1', 'frame')],
+            self.file_name, 'csv')
+
+        self.assertEqual([['frame (Object #2)', 'frame (Object #1)'],
+                          ['', '0'], ['1', ''], ['2', ''], ['3', ''],
+                          ['', '4']], self.read_rows())
+
+
+class TestExportProgress(TestObjectController):
+    DATA_TO_EXPORT = [('Object #1', 'x'), ('Object #2', 'y')]
+
+    def test_progress(self):
+        progress = MagicMock(return_value=True)
+
+        self.assertTrue(self.controller.export_to_file(
+            self.DATA_TO_EXPORT, self.file_name, 'csv', progress, 2))
+
+        self.assertEqual([((2, 5),), ((4, 5),), ((5, 5),)],
+                         progress.call_args_list)
+        self.assertEqual(6, len(self.read_rows()))
+
+    def test_cancel(self):
+        for format_ in ('csv', 'npz', 'npy'):
+            with self.subTest(format_=format_):
+                progress = MagicMock(return_value=False)
+
+                self.assertFalse(self.controller.export_to_file(
+                    self.DATA_TO_EXPORT, self.file_name, format_, progress,
+                    2))
+
+                progress.assert_called_once_with(2, 5)
+                self.assertEqual([], os.listdir(self.directory.name))
+
+    def test_cancel_keeps_existing_file(self):
+        for format_ in ('csv', 'npz', 'npy'):
+            with self.subTest(format_=format_):
+                with open(self.file_name, 'w') as f:
+                    f.write('existing')
+
+                self.controller.export_to_file(
+                    self.DATA_TO_EXPORT, self.file_name, format_,
+                    MagicMock(return_value=False), 2)
+
+                with open(self.file_name) as f:
+                    self.assertEqual('existing', f.read())
+                self.assertEqual([os.path.basename(self.file_name)],
+                                 os.listdir(self.directory.name))
+
+    def test_npz_duplicate_columns(self):
+        self.controller.export_to_file(
+            [('Object #1', 'x'), ('Object #1', 'x')], self.file_name, 'npz')
+
+        with np.load(self.file_name) as data:
+            self.assertEqual(['x (Object #1)', 'x (Object #1) #2'],
+                             data['columns'].tolist())
+            for column in data['columns']:
+                self.assertEqual(3, np.count_nonzero(
+                    np.isfinite(data[column])))
@@ -0,0 +1,83 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from PyQt5.QtWidgets import QApplication
+import pyqtgraph
+
+from object_model.object_graph import ObjectGraph, ALL_OBJECTS
+
+
+app = QApplication.instance() or QApplication([])
+
+
+class MockGraphSeries:
+    def __init__(self, plot_item, pen=None, symbol_brush='k', name=None):
+        self.pen = pen
+        self.plot = MagicMock()
+        self.remove = MagicMock()
+        self.update_symbols = MagicMock()
+
+
+class MockObject:
+    def __init__(self, name):
+        self.get_name = MagicMock(return_value=name)
+
+
+class MockObjectDisplay:
+    def __init__(self):
+        self.names = ['Object #1', 'Object #2']
+        self.ids = {'Object #1': 1, 'Object #2': 2}
+        self.versions = {'Object #1': 0, 'Object #2': 0}
+
+        self.get_current_object = MagicMock(
+            return_value=MockObject('Object #1'))
+        self.get_current_object_available_measurements = MagicMock(
+            return_value={'x': 'm', 'y': 'm'})
+        self.get_object_names = MagicMock(side_effect=lambda: self.names)
+        self.get_object_id = MagicMock(side_effect=lambda name: self.ids[name])
+        self.get_data_versions = MagicMock(
+            side_effect=lambda names: {name: self.versions[name]
+                                       for name in names})
+        self.get_measurement_arrays_per_object = MagicMock(
+            side_effect=lambda names, *args: {
+                name: (np.arange(3), {arg: np.zeros(3) for arg in args})
+                for name in names})
+
+
+class TestObjectGraph(TestCase):
+    def setUp(self):
+        self.display = MockObjectDisplay()
+        self.graph = ObjectGraph(self.display, MockGraphSeries)
+        self.graph.initialise_graph()
+        self.graph.set_plotted_objects(ALL_OBJECTS)
+        self.display.get_measurement_arrays_per_object.reset_mock()
+
+    def test_only_changed_objects_replotted(self):
+        self.display.versions['Object #2'] += 1
+        self.graph.update()
+
+        self.display.get_measurement_arrays_per_object.assert_called_once_with(
+            ['Object #2'], 'x', 'y')
+
+    def test_unchanged_objects_not_replotted(self):
+        self.graph.update()
+
+        self.display.get_measurement_arrays_per_object.assert_not_called()
+
+    def test_colour_kept_after_removal(self):
+        self.display.names.remove('Object #1')
+        self.graph.object_removed('Object #1')
+        self.graph.set_plotted_objects(ALL_OBJECTS)
+
+        self.assertEqual(pyqtgraph.intColor(2),
+                         self.graph._series['Object #2'].pen)
+
+    def test_legend_removed(self):
+        self.assertIsNotNone(self.graph.plotItem.legend)
+
+        self.graph.set_plotted_objects(None)
+
+        self.assertIsNone(self.graph.plotItem.legend)
+        self.assertEqual(['Object #1'], list(self.graph._series))
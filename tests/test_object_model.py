@@ -0,0 +1,336 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import random
+
+import numpy as np
+from numpy.testing import assert_allclose
+
+from object_model.object_model import ObjectModel, InvalidMeasurementError
+from object_model.point_store import PointStore
+from object_model.measurement_engine import MeasurementEngine, \
+    MeasurementCycleError
+from object_model.derivatives import calculate_derivative, \
+    DERIVATIVE_SCHEMES, UnknownDerivativeSchemeError
+
+
+class MockObjectController:
+    def __init__(self):
+        self.get_origin_pos = MagicMock(return_value=(0, 0))
+        self.get_reference_angle = MagicMock(return_value=0)
+        self.get_ruler_length = MagicMock(return_value=(10, 1, 'm'))
+        self.get_times = MagicMock(side_effect=lambda frames: frames / 10)
+        self.get_calibration_version = MagicMock(return_value=(0, 0))
+        self.get_derivative_scheme = MagicMock(return_value='backward')
+        self.points_changed = MagicMock()
+
+
+def create_test_model(points=None):
+    return ObjectModel(MockObjectController(), points, 'Test')
+
+
+class TestPointStore(TestCase):
+    def test_insert_keeps_order(self):
+        store = PointStore()
+        for frame in (5, 1, 3, 100, 0):
+            store.set_point(frame, frame, -frame)
+
+        self.assertEqual([0, 1, 3, 5, 100], store.get_frames().tolist())
+        self.assertEqual([0, 1, 3, 5, 100], store.get_x().tolist())
+        self.assertEqual([0, -1, -3, -5, -100], store.get_y().tolist())
+
+    def test_overwrite(self):
+        store = PointStore()
+        self.assertEqual((0, True), store.set_point(3, 1, 2))
+        self.assertEqual((0, False), store.set_point(3, 4, 5))
+
+        self.assertEqual({3: (4, 5)}, store.to_dict())
+
+    def test_growth(self):
+        store = PointStore()
+        for frame in range(1000, 0, -1):
+            store.set_point(frame, frame, 0)
+
+        self.assertEqual(1000, len(store))
+        self.assertEqual(list(range(1, 1001)), store.get_frames().tolist())
+
+    def test_remove(self):
+        store = PointStore({1: (1, 1), 2: (2, 2), 3: (3, 3)})
+
+        self.assertEqual(1, store.remove_point(2))
+        self.assertIsNone(store.remove_point(2))
+        self.assertEqual({1: (1, 1), 3: (3, 3)}, store.to_dict())
+
+
+class TestObjectModel(TestCase):
+    def test_non_integer_frame(self):
+        model = create_test_model()
+        self.assertRaises(TypeError, model.add_point, 0, 0, 1.5)
+
+    def test_invalid_measurement(self):
+        model = create_test_model()
+        self.assertRaises(InvalidMeasurementError,
+                          model.calculate_measurement, 'z')
+
+    def test_true_position(self):
+        model = create_test_model({0: (10, -20)})
+        data = model.get_data('x', 'y')
+
+        self.assertAlmostEqual(1, data[0]['x'])
+        self.assertAlmostEqual(2, data[0]['y'])
+
+    def test_rotated_position(self):
+        model = create_test_model({0: (10, 0)})
+        model._object_controller.get_reference_angle.return_value = 90
+        data = model.get_data('x', 'y')
+
+        self.assertAlmostEqual(0, data[0]['x'])
+        self.assertAlmostEqual(1, data[0]['y'])
+
+    def test_last_n_points(self):
+        model = create_test_model({i: (i, i) for i in range(20)})
+
+        self.assertEqual({18: (18, 18), 19: (19, 19)},
+                         model.get_last_n_points(2))
+
+    def test_points_between(self):
+        model = create_test_model({i: (i, i) for i in range(0, 20, 2)})
+
+        self.assertEqual({4: (4, 4), 6: (6, 6)},
+                         model.get_points_between(3, 6))
+        self.assertEqual({}, model.get_points_between(21, 30))
+
+    def test_nearest_point(self):
+        model = create_test_model({i: (i, i) for i in range(0, 20, 4)})
+
+        self.assertEqual((0, (0, 0)), model.get_nearest_point(-5))
+        self.assertEqual((4, (4, 4)), model.get_nearest_point(5))
+        self.assertEqual((4, (4, 4)), model.get_nearest_point(6))
+        self.assertEqual((8, (8, 8)), model.get_nearest_point(7))
+        self.assertEqual((16, (16, 16)), model.get_nearest_point(100))
+        self.assertIsNone(create_test_model().get_nearest_point(0))
+
+    def test_dump_load(self):
+        model = create_test_model()
+        model.add_point(1.5, 2.5, 4)
+        model.add_point(3.5, 4.5, 2)
+
+        loaded = create_test_model()
+        loaded.load({'points': {str(k): list(v) for k, v in
+                                model.dump()['points'].items()},
+                     'name': 'Loaded'})
+
+        self.assertEqual({2: (3.5, 4.5), 4: (1.5, 2.5)},
+                         loaded.dump()['points'])
+        self.assertEqual('Loaded', loaded.get_name())
+
+
+class TestMeasurementEngine(TestCase):
+    def test_each_node_evaluated_once(self):
+        calls = []
+
+        def node(name, value):
+            def calculate(*args):
+                calls.append(name)
+                return value + sum(args)
+            return calculate
+
+        engine = MeasurementEngine({
+            'a': ((), lambda window: node('a', 1)()),
+            'b': (('a',), node('b', 1)),
+            'c': (('a', 'b'), node('c', 1)),
+        })
+
+        self.assertEqual({'c': 4, 'b': 2}, engine.evaluate('c', 'b'))
+        self.assertEqual(['a', 'b', 'c'], calls)
+
+    def test_partial_invalidation(self):
+        calls = []
+
+        def source(name):
+            def calculate(window):
+                calls.append(name)
+                return np.ones(3)
+            return calculate
+
+        engine = MeasurementEngine({
+            'a': ((), source('a')),
+            'b': ((), source('b')),
+            'c': (('a', 'b'), lambda a, b: a + b),
+        }, key_groups={'a': ('first',), 'b': ('second',), 'c': ()})
+
+        engine.validate_cache({'first': 0, 'second': 0})
+        engine.evaluate('c')
+        engine.validate_cache({'first': 0, 'second': 1})
+        engine.evaluate('c')
+
+        self.assertEqual(['a', 'b', 'b'], calls)
+
+    def test_cycle(self):
+        engine = MeasurementEngine({
+            'a': (('b',), lambda b: b),
+            'b': (('a',), lambda a: a),
+        })
+        self.assertRaises(MeasurementCycleError, engine.evaluate, 'a')
+
+
+class TestObjectModelMeasurements(TestCase):
+    def setUp(self):
+        # x = t^2 (in m), sampled every 0.1s
+        self.model = create_test_model(
+            {i: (10 * (i / 10) ** 2, 0) for i in range(5)})
+
+    def test_first_derivative_is_none(self):
+        data = self.model.get_data('vx', 'ax', 'v', 'a')
+
+        for measurement in ('vx', 'ax', 'v', 'a'):
+            self.assertIsNone(data[0][measurement])
+        self.assertIsNone(data[1]['ax'])
+
+    def test_derivatives(self):
+        data = self.model.get_data('vx', 'ax', 'a')
+
+        self.assertAlmostEqual(0.7, data[4]['vx'])
+        self.assertAlmostEqual(2, data[4]['ax'])
+        self.assertAlmostEqual(2, data[4]['a'])
+
+    def test_times_shared(self):
+        self.model.get_data('t', 'vx', 'vy', 'ax', 'ay', 'a')
+
+        self.assertEqual(1, self.model._object_controller.get_times.call_count)
+
+    def test_blank_column(self):
+        data = self.model.get_data('', 'frame')
+
+        self.assertEqual({'': '', 'frame': 3}, data[3])
+
+
+class TestObjectModelCache(TestCase):
+    def setUp(self):
+        self.model = create_test_model({i: (i, 0) for i in range(5)})
+        self.controller = self.model._object_controller
+
+    def test_repeated_request_cached(self):
+        self.model.get_data('t', 'x')
+        self.model.get_data('t', 'x')
+
+        self.assertEqual(1, self.controller.get_times.call_count)
+        self.assertEqual(1, self.controller.get_origin_pos.call_count)
+
+    def test_calibration_change(self):
+        self.model.get_data('x')
+        self.controller.get_ruler_length.return_value = (1, 1, 'm')
+        self.controller.get_calibration_version.return_value = (1, 0)
+
+        self.assertEqual(4, self.model.get_data('x')[4]['x'])
+
+    def test_spatial_calibration_keeps_pixels(self):
+        self.model.get_data('vx', 'ax')
+        self.controller.get_ruler_length.return_value = (1, 1, 'm')
+        self.controller.get_reference_angle.return_value = 90
+        self.controller.get_calibration_version.return_value = (1, 0)
+
+        data = self.model.get_data('vx', 'vy', 'ax')
+
+        self.assertEqual(1, self.controller.get_times.call_count)
+        self.assertAlmostEqual(0, data[4]['vx'])
+        self.assertAlmostEqual(10, data[4]['vy'])
+        self.assertAlmostEqual(0, data[4]['ax'])
+
+    def test_time_calibration(self):
+        self.model.get_data('vx')
+        self.controller.get_times.side_effect = lambda frames: frames / 20
+        self.controller.get_calibration_version.return_value = (0, 1)
+
+        self.assertAlmostEqual(2, self.model.get_data('vx')[4]['vx'])
+
+    def test_point_change(self):
+        self.model.get_data('x')
+        self.model.add_point(50, 0, 4)
+
+        self.assertEqual(5, self.model.get_data('x')[4]['x'])
+
+
+class TestObjectModelIncremental(TestCase):
+    MEASUREMENTS = ('frame', 't', 'x', 'y', 'r', 'vx', 'vy', 'v', 'ax', 'ay',
+                    'a')
+
+    def assert_matches_full_calculation(self, model):
+        frames, values = model.get_measurement_arrays(*self.MEASUREMENTS)
+
+        fresh = create_test_model(model.dump()['points'])
+        fresh._object_controller = model._object_controller
+        fresh_frames, fresh_values = fresh.get_measurement_arrays(
+            *self.MEASUREMENTS)
+
+        self.assertEqual(fresh_frames.tolist(), frames.tolist())
+        for measurement in self.MEASUREMENTS:
+            assert_allclose(fresh_values[measurement], values[measurement],
+                            err_msg=measurement)
+
+    def test_random_changes(self):
+        for scheme in DERIVATIVE_SCHEMES:
+            with self.subTest(scheme=scheme):
+                self.check_random_changes(scheme)
+
+    def check_random_changes(self, scheme):
+        rng = random.Random(0)
+        model = create_test_model({i: (i, i) for i in range(0, 40, 2)})
+        model._object_controller.get_derivative_scheme.return_value = scheme
+        model.get_measurement_arrays(*self.MEASUREMENTS)
+
+        for _ in range(100):
+            frame = rng.randrange(50)
+            if rng.random() < 0.3:
+                model.remove_point(frame)
+            else:
+                model.add_point(rng.uniform(-50, 50), rng.uniform(-50, 50),
+                                frame)
+            self.assert_matches_full_calculation(model)
+
+    def test_change_notified(self):
+        model = create_test_model({i: (i, i) for i in range(10)})
+        model.get_data('vx', 'ax')
+        model.add_point(0, 0, 5)
+
+        # The point and the accelerations after it that depend on it
+        model._object_controller.points_changed.assert_called_once_with(
+            model, 5, 'update', 3, 8)
+
+    def test_only_new_time_calculated(self):
+        model = create_test_model({i: (i, i) for i in range(10)})
+        model.get_data('vx', 'ax')
+        model.add_point(0, 0, 10)
+
+        self.assertEqual(2, model._object_controller.get_times.call_count)
+        self.assertEqual(
+            [10], model._object_controller.get_times.call_args[0][0].tolist())
+
+
+class TestDerivatives(TestCase):
+    def test_backward(self):
+        derivatives = calculate_derivative([0, 1, 4, 9], [0, 1, 2, 3])
+
+        assert_allclose([np.nan, 1, 3, 5], derivatives)
+
+    def test_central_uneven(self):
+        # Central differences are exact for quadratics, even when uneven
+        times = np.array([0, 1, 3, 4, 7], dtype=float)
+        derivatives = calculate_derivative(times ** 2, times, 'central')
+
+        assert_allclose([np.nan, 2, 6, 8, np.nan], derivatives)
+
+    def test_five_point_uneven(self):
+        # Five-point stencils are exact for quartics
+        times = np.array([0, 1, 3, 4, 7, 8], dtype=float)
+        derivatives = calculate_derivative(times ** 4, times, 'five_point')
+
+        assert_allclose([np.nan, np.nan, 4 * 3 ** 3, 4 * 4 ** 3, np.nan,
+                         np.nan], derivatives)
+
+    def test_too_few_points(self):
+        assert_allclose([np.nan], calculate_derivative([1], [0], 'central'))
+
+    def test_unknown_scheme(self):
+        self.assertRaises(UnknownDerivativeSchemeError, calculate_derivative,
+                          [0, 1], [0, 1], 'forward')
@@ -0,0 +1,54 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from object_model.object_registry import ObjectRegistry, \
+    DuplicateObjectNameError, UnknownObjectError
+
+
+class MockObject:
+    def __init__(self, name):
+        self._name = name
+
+    def get_name(self):
+        return self._name
+
+    def set_name(self, name):
+        self._name = name
+
+
+class TestObjectRegistry(TestCase):
+    def setUp(self):
+        self.registry = ObjectRegistry()
+        self.listener = MagicMock()
+        self.registry.add_listener(self.listener)
+
+        self.objects = [MockObject(name) for name in ('a', 'b', 'c')]
+        for object_ in self.objects:
+            self.registry.add(object_)
+
+    def test_add(self):
+        self.assertEqual(['a', 'b', 'c'], self.registry.get_names())
+        self.assertIs(self.objects[1], self.registry.get('b'))
+        self.assertIsNone(self.registry.get('d'))
+        self.listener.object_added.assert_called_with('c')
+
+        self.assertRaises(DuplicateObjectNameError, self.registry.add,
+                          MockObject('a'))
+
+    def test_remove(self):
+        self.assertIs(self.objects[0], self.registry.remove('a'))
+
+        self.assertEqual(['b', 'c'], self.registry.get_names())
+        self.listener.object_removed.assert_called_once_with('a')
+        self.assertRaises(UnknownObjectError, self.registry.remove, 'a')
+
+    def test_rename(self):
+        self.registry.rename('b', 'd')
+
+        self.assertEqual(['a', 'd', 'c'], self.registry.get_names())
+        self.assertEqual('d', self.objects[1].get_name())
+        self.assertIs(self.objects[1], self.registry.get('d'))
+        self.listener.object_renamed.assert_called_once_with('b', 'd')
+
+        self.assertRaises(DuplicateObjectNameError, self.registry.rename,
+                          'a', 'c')
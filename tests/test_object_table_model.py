@@ -0,0 +1,57 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from PyQt5.QtCore import Qt
+
+from object_model.object_table_model import ObjectTableModel
+
+
+class TestObjectTableModel(TestCase):
+    def setUp(self):
+        self.model = ObjectTableModel()
+        self.model.set_columns(['frame', 'x', ''], ['frame', 'x (m)', ''])
+        self.model.set_data(np.array([1, 2, 3]),
+                            {'frame': np.array([1, 2, 3]),
+                             'x': np.array([np.nan, 0.123456, 2.0])})
+
+    def get_text(self, row, column):
+        return self.model.data(self.model.index(row, column))
+
+    def test_formatting(self):
+        self.assertEqual(3, self.model.rowCount())
+        self.assertEqual(3, self.model.columnCount())
+        self.assertEqual('2', self.get_text(1, 0))
+        self.assertEqual('', self.get_text(0, 1))
+        self.assertEqual('0.123', self.get_text(1, 1))
+        self.assertEqual('', self.get_text(1, 2))
+        self.assertEqual('x (m)', self.model.headerData(1, Qt.Horizontal))
+
+    def test_rows_inserted(self):
+        inserted = MagicMock()
+        self.model.rowsInserted.connect(inserted)
+
+        self.model.set_data(np.arange(5), {'frame': np.arange(5),
+                                           'x': np.zeros(5)})
+
+        self.assertEqual(5, self.model.rowCount())
+        self.assertEqual((3, 4), tuple(inserted.call_args[0][1:]))
+
+    def test_apply_changes(self):
+        changed = MagicMock()
+        self.model.dataChanged.connect(changed)
+
+        # Insert a point at row 1, which changes it and the row after it
+        self.model.apply_changes(
+            [(1, 'insert', 1, 3)], np.array([1, 5, 2, 3]),
+            {'frame': np.array([1, 5, 2, 3]), 'x': np.zeros(4)})
+
+        self.assertEqual(4, self.model.rowCount())
+        self.assertEqual('5', self.get_text(1, 0))
+        start, stop = changed.call_args[0][:2]
+        self.assertEqual((1, 2), (start.row(), stop.row()))
+
+    def test_get_rows_text(self):
+        self.assertEqual([['x (m)', 'frame'], ['', '1'], ['0.123456', '2']],
+                         self.model.get_rows_text([0, 1], [1, 0]))
@@ -76,3 +76,10 @@ class TestOverlayControllerFunctions(TestOverlayController):
 
         self.overlay_controller._reference_axes.set_reference_angle. \
             assert_called_once_with(angle)
+
+    def test_calibration_version(self):
+        version = self.overlay_controller.get_calibration_version()
+        self.overlay_controller.set_reference_angle(45)
+
+        self.assertNotEqual(version,
+                            self.overlay_controller.get_calibration_version())
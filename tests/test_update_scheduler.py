@@ -0,0 +1,70 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from object_model.update_scheduler import UpdateScheduler, POINTS, \
+    CALIBRATION
+
+
+class TestUpdateScheduler(TestCase):
+    def setUp(self):
+        self.flush = MagicMock()
+        self.callbacks = []
+        self.time = 0
+        self.scheduler = UpdateScheduler(
+            self.flush, lambda callback, delay: self.callbacks.append(
+                (self.time + delay, callback)),
+            lambda: self.time, 0.1)
+
+    def run_scheduled(self):
+        callbacks, self.callbacks[:] = sorted(self.callbacks,
+                                              key=lambda c: c[0]), []
+        for time, callback in callbacks:
+            self.time = max(self.time, time)
+            callback()
+
+    def test_coalesced(self):
+        self.scheduler.invalidate(POINTS)
+        self.scheduler.invalidate(CALIBRATION)
+        self.scheduler.invalidate(POINTS)
+
+        self.assertEqual(1, len(self.callbacks))
+        self.flush.assert_not_called()
+
+        self.run_scheduled()
+
+        self.flush.assert_called_once_with({POINTS, CALIBRATION})
+        self.assertFalse(self.scheduler.is_pending())
+
+    def test_reschedules_after_flush(self):
+        self.scheduler.invalidate(POINTS)
+        self.run_scheduled()
+        self.scheduler.invalidate(CALIBRATION)
+        self.run_scheduled()
+
+        self.assertEqual(2, self.flush.call_count)
+        self.flush.assert_called_with({CALIBRATION})
+
+    def test_flush_now(self):
+        self.scheduler.invalidate(POINTS)
+        self.scheduler.flush()
+        self.run_scheduled()
+
+        self.flush.assert_called_once_with({POINTS})
+
+    def test_throttled(self):
+        self.scheduler.invalidate(CALIBRATION, throttle=True)
+        self.run_scheduled()
+        self.time = 0.05
+
+        self.scheduler.invalidate(CALIBRATION, throttle=True)
+        self.scheduler.invalidate(CALIBRATION, throttle=True)
+
+        self.assertEqual([0.1], [time for time, _ in self.callbacks])
+
+        # An unthrottled change (e.g. a mouse release) isn't delayed
+        self.scheduler.invalidate(POINTS)
+        self.run_scheduled()
+
+        self.assertEqual(2, self.flush.call_count)
+        self.flush.assert_called_with({CALIBRATION, POINTS})
+        self.assertEqual(0.1, self.time)
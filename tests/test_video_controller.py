@@ -20,6 +20,11 @@ class MockVideoPlayer:
         self.set_update_interval = MagicMock()
         self.toggle_play_state = MagicMock()
         self.set_video_file = MagicMock()
+        self.add_frame_listener = MagicMock()
+        self.get_shown_cached_frame = MagicMock(return_value=None)
+        self.load = MagicMock()
+        self.dump = MagicMock(return_value={})
+        self.get_video_file = MagicMock(return_value='video.mp4')
 
         self._position = 0
         self.frame_rate = 1
@@ -30,6 +35,9 @@ class MockVideoPlayer:
     def set_position(self, new_position):
         self._position = new_position
 
+    def show_position(self, new_position, step=None):
+        self._position = new_position
+
     def get_duration(self):
         return 10000  # 10 seconds (1fps => 10 frames)
 
@@ -40,6 +48,7 @@ class MockVideoDisplay:
         self.get_video_widget = MagicMock(return_value=MOCK_VIDEO_WIDGET)
         self.set_media_state = MagicMock()
         self.enable_controls = MagicMock()
+        self.show_frame = MagicMock()
 
 
 def create_test_controller(*args, **kwargs):
@@ -169,4 +178,45 @@ class TestVideoControllerFunctions(TestVideoController):
             file_path)
         self.video_controller._video_display.enable_controls.assert_called()
 
+    def test_calibration_version(self):
+        version = self.video_controller.get_calibration_version()
+        self.video_controller.set_fps(30)
+        fps_version = self.video_controller.get_calibration_version()
+        self.video_controller.set_time(10, 1.0)
+
+        self.assertNotEqual(version, fps_version)
+        self.assertNotEqual(fps_version,
+                            self.video_controller.get_calibration_version())
+
+    def test_get_times(self):
+        self.video_controller.set_fps(10)
+        self.video_controller.set_time(5, 2.0)
+
+        times = self.video_controller.get_times([0, 5, 15])
+
+        self.assertEqual([1.5, 2.0, 3.0], times.tolist())
+        self.assertEqual(
+            [self.video_controller.get_time(f) for f in (0, 5, 15)],
+            times.tolist())
+
+    def test_cached_frame_shown(self):
+        video_player = self.video_controller._video_player
+        video_player.add_frame_listener.assert_called_once_with(
+            self.video_controller._frame_changed)
+
+        image = object()
+        video_player.get_shown_cached_frame.return_value = image
+        self.video_controller._frame_changed()
+
+        self.video_controller._video_display.show_frame.assert_called_with(
+            image)
+
+    def test_video_player_settings_saved(self):
+        video_player = self.video_controller._video_player
+        video_player.dump.return_value = {'prefetch_depth': 4}
+
+        data = self.video_controller.dump()
+        self.assertEqual({'prefetch_depth': 4}, data['video_player'])
 
+        self.video_controller.load(data)
+        video_player.load.assert_called_once_with({'prefetch_depth': 4})
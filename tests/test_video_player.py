@@ -1,13 +1,17 @@
 from unittest import TestCase
+from unittest.mock import MagicMock
 
 from video_tracker.video_display.video_player import VideoPlayer
 
-from PyQt5.QtMultimedia import QMediaPlayer
+from PyQt5.QtMultimedia import QMediaPlayer, QVideoFrame
+from PyQt5.QtGui import QImage, QColor
+from PyQt5.QtCore import QRect, QSize
 
 
 class TestVideoPlayer(TestCase):
     def setUp(self):
-        self.video_player = VideoPlayer()
+        # Don't use the user's media info cache
+        self.video_player = VideoPlayer(media_info_cache=MagicMock())
 
 
 class TestInit(TestVideoPlayer):
@@ -26,3 +30,51 @@ class TestSetVideoFile(TestVideoPlayer):
 
 class TestToggle(TestVideoPlayer):
     pass
+
+
+class TestFrameProbed(TestVideoPlayer):
+    def setUp(self):
+        super().setUp()
+        image = QImage(64, 48, QImage.Format_RGB32)
+        image.fill(QColor('red'))
+        self.frame = QVideoFrame(image)
+
+    def test_listeners_notified(self):
+        listener = MagicMock()
+        self.video_player.add_frame_listener(listener)
+
+        self.video_player._frame_probed(self.frame)
+
+        listener.assert_called_once_with()
+
+    def test_no_frame(self):
+        self.assertIsNone(self.video_player.get_latest_frame_size())
+        self.assertIsNone(self.video_player.crop_latest_frame(
+            QRect(0, 0, 10, 10)))
+
+    def test_crop_latest_frame(self):
+        self.video_player._frame_probed(self.frame)
+
+        self.assertEqual(self.video_player.get_latest_frame_size(),
+                         QSize(64, 48))
+
+        crop = self.video_player.crop_latest_frame(QRect(10, 10, 5, 4))
+        self.assertEqual(crop.size(), QSize(5, 4))
+        self.assertEqual(crop.pixelColor(0, 0), QColor('red'))
+
+    def test_frame_cached_when_stepping(self):
+        self.video_player._media_info = {}
+        self.video_player.frame_rate = 10.0
+
+        self.frame.setStartTime(300000)  # us
+        self.video_player._frame_probed(self.frame)
+
+        self.assertIn(3, self.video_player.get_frame_cache())
+
+    def test_untimestamped_frame_not_cached(self):
+        self.video_player._media_info = {}
+        self.video_player.frame_rate = 10.0
+
+        self.video_player._frame_probed(self.frame)
+
+        self.assertEqual(0, len(self.video_player.get_frame_cache()))
@@ -8,7 +8,6 @@
 
 from PyQt5.QtWidgets import QApplication, QMainWindow, QSplitter, QAction, \
     QWidget, QVBoxLayout, QFileDialog
-from PyQt5.QtCore import QTimer
 
 import platform
 import ctypes
@@ -75,14 +74,6 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(
             'Video Tracker')  # TODO: Come up with a better title
 
-        # Update the magnifying glass periodically
-        self._magnifying_glass = self._overlay_controller.get_magnifying_glass()
-        self._magnifying_glass_timer = QTimer(self)
-        self._magnifying_glass_timer.setInterval(100)
-        self._magnifying_glass_timer.timeout.connect(
-            self._magnifying_glass.update_image)
-        self._magnifying_glass_timer.start()
-
     def _open_video(self, checked):
         file_name, _ = QFileDialog.getOpenFileName(
             caption='Import Video',
@@ -192,6 +183,7 @@ if __name__ == '__main__':
     make_dpi_aware()
 
     app = QApplication([])
+    app.setApplicationName('video-tracker')
     main = MainWindow()
     main.show()
 
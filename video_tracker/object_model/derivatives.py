@@ -0,0 +1,100 @@
+# Imports
+import numpy as np
+
+
+# Constants
+# The offsets of the neighbouring points used to calculate each derivative
+DERIVATIVE_SCHEMES = {
+    'backward': (-1, 0),
+    'central': (-1, 0, 1),
+    'five_point': (-2, -1, 0, 1, 2),
+}
+SCHEME_NAMES = {
+    'backward': 'Backward difference',
+    'central': 'Central difference',
+    'five_point': 'Five-point stencil',
+}
+DEFAULT_SCHEME = 'backward'
+
+
+# Exceptions
+class UnknownDerivativeSchemeError(Exception):
+    pass
+
+
+# Functions
+def validate_scheme(scheme):
+    """
+    Raises an UnknownDerivativeSchemeError if the scheme is not known.
+    """
+    if scheme not in DERIVATIVE_SCHEMES:
+        raise UnknownDerivativeSchemeError(
+            f'{scheme} is not a known derivative scheme (acceptable: '
+            f'{", ".join(DERIVATIVE_SCHEMES)})')
+
+
+def get_radius(scheme):
+    """
+    Returns how far the scheme reaches from the point it is calculated at
+    (i.e. how many points either side of a point affect its derivative).
+    """
+    validate_scheme(scheme)
+    return max(abs(offset) for offset in DERIVATIVE_SCHEMES[scheme])
+
+
+def calculate_derivative(values, times, scheme=DEFAULT_SCHEME):
+    """
+    Approximates the derivative of a series of values with respect to time,
+    for the whole series at once.
+
+    The derivative at each point is the derivative of the polynomial through
+    the neighbouring points given by the scheme, so uneven spacing (e.g.
+    skipped frames) is handled. Points without enough neighbours are NaN.
+
+    :param values: The values to differentiate.
+    :param times: The times of the values (s), in increasing order.
+    :param scheme: The scheme to use (one of DERIVATIVE_SCHEMES).
+    :return: An array of the derivatives.
+    """
+    validate_scheme(scheme)
+
+    offsets = DERIVATIVE_SCHEMES[scheme]
+    values = np.asarray(values, dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64)
+
+    derivatives = np.full(len(values), np.nan)
+
+    # The points that have all of the neighbours they need
+    start = -min(offsets)
+    stop = len(values) - max(offsets)
+
+    if stop <= start:
+        return derivatives
+
+    def shifted(array, offset):
+        return array[start + offset:stop + offset]
+
+    centre_times = shifted(times, 0)
+
+    # Weights are the derivatives of the Lagrange basis polynomials at the
+    # centre point
+    result = np.zeros(stop - start)
+
+    for offset in offsets:
+        if offset == 0:
+            weight = sum(1 / (centre_times - shifted(times, other))
+                         for other in offsets if other != 0)
+        else:
+            offset_times = shifted(times, offset)
+            weight = 1 / (offset_times - centre_times)
+            for other in offsets:
+                if other not in (0, offset):
+                    other_times = shifted(times, other)
+                    weight = weight * (centre_times - other_times) / \
+                        (offset_times - other_times)
+
+        result += weight * shifted(values, offset)
+
+    derivatives[start:stop] = result
+
+    return derivatives
@@ -1,6 +1,6 @@
 # Imports
 from PyQt5.QtWidgets import QDialog, QGridLayout, QCheckBox, QFrame, QLabel, \
-    QWidget, QVBoxLayout, QPushButton, QFileDialog
+    QWidget, QVBoxLayout, QPushButton, QFileDialog, QProgressDialog
 from PyQt5.QtCore import Qt
 
 
@@ -8,6 +8,8 @@ from PyQt5.QtCore import Qt
 ITEMS_BEFORE_TABLE = 3
 AVAILABLE_EXPORT_FORMATS = (
     ('Comma separated values', 'csv'),
+    ('NumPy archive of columns', 'npz'),
+    ('NumPy array (memory-mappable)', 'npy'),
 )
 EXPORT_FORMATS_DICT = {x[0]+' (*.'+x[1]+')': x[1] for x in
                        AVAILABLE_EXPORT_FORMATS}
@@ -199,7 +201,22 @@ class ExportDialog(QDialog):
 
         format_ = EXPORT_FORMATS_DICT[long_format]
 
-        self._object_controller.export_to_file(data_to_export, file_name,
-                                               format_)
+        progress_dialog = QProgressDialog('Exporting data...', 'Cancel', 0, 0,
+                                          self)
+        progress_dialog.setWindowTitle('Export Data')
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(500)
 
-        self.accept()
+        def progress(rows_written, num_rows):
+            # As the dialog is modal, setValue also processes events
+            progress_dialog.setMaximum(num_rows)
+            progress_dialog.setValue(rows_written)
+            return not progress_dialog.wasCanceled()
+
+        completed = self._object_controller.export_to_file(
+            data_to_export, file_name, format_, progress)
+
+        progress_dialog.close()
+
+        if completed:
+            self.accept()
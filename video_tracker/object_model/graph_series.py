@@ -0,0 +1,194 @@
+# Imports
+import numpy as np
+
+# Constants
+INITIAL_CAPACITY = 256
+# The most points per (horizontal) pixel of the view that are drawn with
+# symbols; any denser and only the line is drawn
+SYMBOL_DENSITY = 0.25
+# How many appended points are drawn by the tail curve before they are
+# merged into the main curve
+TAIL_LENGTH = 256
+# How many of the last points are always drawn by the tail curve, so that
+# changes near the end (and the derivatives around them) only redraw it
+MIN_TAIL_LENGTH = 16
+
+
+# Classes
+class GraphSeries:
+    # The plotted points of one object. The points are kept in buffers that
+    # grow geometrically, so that new points can be appended without
+    # rebuilding the whole series, and recently appended points are drawn by
+    # a short tail curve so that only it needs redrawing
+    def __init__(self, plot_item, pen=None, symbol_brush='k', name=None):
+        """
+        :param plot_item: The PlotItem to draw the series in.
+        :param pen: The pen to draw the line with (None for the default).
+        :param symbol_brush: The brush to draw the symbols with.
+        :param name: The name to show in the legend (if any).
+        """
+        self._plot_item = plot_item
+
+        line_style = {} if pen is None else {'pen': pen}
+        style = dict(line_style, symbolBrush=symbol_brush)
+        if pen is not None:
+            style['symbolPen'] = pen
+
+        # Only the main curve is named, so it is the one in the legend
+        self._curve = plot_item.plot(name=name, **style)
+        self._tail = plot_item.plot(**style)
+        # The line (without symbols) from the last point of the main curve
+        # to the first point of the tail, so that the line is continuous
+        # without either point's symbol being drawn twice
+        self._joint = plot_item.plot(**line_style)
+
+        self._x = np.empty(INITIAL_CAPACITY)
+        self._y = np.empty(INITIAL_CAPACITY)
+        self._indices = np.empty(INITIAL_CAPACITY, dtype=np.int64)
+        self._size = 0
+
+        # How many of the points the main curve draws
+        self._curve_size = 0
+
+        self._increasing = True
+        self._decimated = None
+        self._symbols_shown = None
+
+    def __len__(self):
+        return self._size
+
+    def get_x(self):
+        """
+        Returns the x values of the plotted points.
+        """
+        return self._x[:self._size]
+
+    def get_y(self):
+        """
+        Returns the y values of the plotted points.
+        """
+        return self._y[:self._size]
+
+    def _ensure_capacity(self, capacity):
+        """
+        Grows the buffers (geometrically) so that they can hold at least the
+        given number of points.
+        """
+        if capacity <= len(self._x):
+            return
+
+        new_capacity = max(capacity, 2 * len(self._x))
+
+        for name in ('_x', '_y', '_indices'):
+            old = getattr(self, name)
+            new = np.empty(new_capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def plot(self, x_values, y_values, start=0):
+        """
+        Plots the values of an object's points, only replacing the points
+        from the given index onwards (the rest must be unchanged).
+
+        :param x_values: An array of the x values of all of the points.
+        :param y_values: An array of the y values of all of the points.
+        :param start: The index of the first point that changed.
+        """
+        x = x_values[start:]
+        y = y_values[start:]
+
+        # Leave out the points that don't have both values
+        present = np.isfinite(x) & np.isfinite(y)
+        indices = np.flatnonzero(present) + start
+
+        keep = int(np.searchsorted(self._indices[:self._size], start))
+        size = keep + len(indices)
+
+        self._ensure_capacity(size)
+        self._x[keep:size] = x[present]
+        self._y[keep:size] = y[present]
+        self._indices[keep:size] = indices
+        self._size = size
+
+        self._update_increasing(keep)
+
+        if keep == 0 or keep < self._curve_size or \
+                self._size - self._curve_size > TAIL_LENGTH:
+            self._redraw()
+        else:
+            self._redraw_tail()
+
+    def _update_increasing(self, keep):
+        """
+        Updates whether the x values are in increasing order, after the
+        points from keep onwards have changed.
+        """
+        x = self.get_x()
+
+        if keep == 0 or not self._increasing:
+            first = 0
+        else:
+            first = keep - 1
+
+        tail = x[first:]
+        increasing = (self._increasing or first == 0) and \
+            bool(np.all(tail[1:] >= tail[:-1]))
+
+        self._increasing = increasing
+
+        # Clipping and decimating (keeping the min and max of each group of
+        # points) both rely on the x values being in increasing order (e.g.
+        # time), which isn't the case for e.g. x against y
+        if self._decimated != increasing:
+            self._decimated = increasing
+            for curve in (self._curve, self._tail):
+                curve.setClipToView(increasing)
+                curve.setDownsampling(auto=increasing, method='peak')
+
+    def _redraw(self):
+        """
+        Redraws all of the points, with all but the last few drawn by the
+        main curve.
+        """
+        self._curve_size = max(self._size - MIN_TAIL_LENGTH, 0)
+        self._curve.setData(self._x[:self._curve_size],
+                            self._y[:self._curve_size])
+        self._redraw_tail()
+
+    def _redraw_tail(self):
+        """
+        Redraws the points after the main curve.
+        """
+        self._tail.setData(self._x[self._curve_size:self._size],
+                           self._y[self._curve_size:self._size])
+
+        first = max(self._curve_size - 1, 0)
+        last = min(self._curve_size + 1, self._size)
+        self._joint.setData(self._x[first:last], self._y[first:last])
+
+    def remove(self):
+        """
+        Removes the series from the plot.
+        """
+        self._plot_item.removeItem(self._curve)
+        self._plot_item.removeItem(self._tail)
+        self._plot_item.removeItem(self._joint)
+
+    def update_symbols(self, left, right, width):
+        """
+        Only draws symbols for the points if they aren't too dense in the
+        given view.
+
+        :param left: The smallest x value in view.
+        :param right: The largest x value in view.
+        :param width: The width of the view (px).
+        """
+        x = self.get_x()
+        visible = np.count_nonzero((x >= left) & (x <= right))
+
+        show = visible <= SYMBOL_DENSITY * max(width, 1)
+
+        if show != self._symbols_shown:
+            self._symbols_shown = show
+            for curve in (self._curve, self._tail):
+                curve.setSymbol('o' if show else None)
@@ -0,0 +1,220 @@
+# Imports
+import numpy as np
+
+
+# Exceptions
+class MeasurementCycleError(Exception):
+    pass
+
+
+# Classes
+class MeasurementEngine:
+    # Evaluates measurements that are defined in terms of each other, so that
+    # shared intermediates (e.g. x for both vx and r) are only calculated once
+    def __init__(self, measurements, radii=None, key_groups=None):
+        """
+        :param measurements: A dict of measurement name ->
+        (dependencies, calculate), where calculate is called with the values
+        of the dependencies (in order) and returns an array of values.
+        Measurements without dependencies are calculated directly from the
+        points, and calculate is instead called with the slice of points to
+        calculate.
+        :param radii: A dict of measurement name -> how many points either
+        side of a point affect its value (e.g. 1 for a backward difference).
+        Measurements that aren't included are calculated point by point.
+        :param key_groups: A dict of measurement name -> the names of the
+        cache keys (see validate_cache) that its calculation directly depends
+        on. Measurements that aren't included depend on every key.
+        """
+        self._measurements = measurements
+        self._radii = radii if radii is not None else {}
+        self._key_groups = key_groups
+
+        self._cache = {}
+        self._cache_keys = {}
+
+    def set_radii(self, radii):
+        """
+        Sets how many points either side of a point affect each measurement
+        (see __init__), e.g. after the derivative scheme changes.
+        """
+        self._radii = radii
+
+    def validate_cache(self, keys):
+        """
+        Clears the cached values that were calculated with a different key
+        (e.g. a different calibration), along with everything calculated from
+        them. Other values are kept.
+
+        :param keys: A dict of key name -> a value identifying something that
+        the measurements depend on.
+        """
+        changed = {name for name, key in keys.items()
+                   if name not in self._cache_keys or
+                   self._cache_keys[name] != key}
+        self._cache_keys = dict(keys)
+
+        if len(changed) == 0:
+            return
+
+        invalid = set()
+        for measurement in self.get_evaluation_order(*self._cache):
+            if self._key_groups is None or \
+                    measurement not in self._key_groups:
+                groups = keys
+            else:
+                groups = self._key_groups[measurement]
+
+            if any(group in changed for group in groups) or \
+                    any(dependency in invalid for dependency in
+                        self.get_dependencies(measurement)):
+                invalid.add(measurement)
+
+        for measurement in invalid:
+            del self._cache[measurement]
+
+    def invalidate(self):
+        """
+        Clears all of the cached values.
+        """
+        self._cache = {}
+        self._cache_keys = {}
+
+    def get_dependencies(self, measurement):
+        """
+        Returns the names of the measurements that the given measurement is
+        calculated from.
+        """
+        return self._measurements[measurement][0]
+
+    def get_evaluation_order(self, *measurements):
+        """
+        Returns the measurements (and everything that they depend on) in an
+        order where each measurement comes after its dependencies.
+
+        :param measurements: The measurements that are required.
+        """
+        order = []
+        visiting = set()
+
+        def visit(measurement):
+            if measurement in order:
+                return
+            if measurement in visiting:
+                raise MeasurementCycleError(f'{measurement} depends on '
+                                            f'itself.')
+
+            visiting.add(measurement)
+            for dependency in self.get_dependencies(measurement):
+                visit(dependency)
+            visiting.remove(measurement)
+
+            order.append(measurement)
+
+        for measurement in measurements:
+            visit(measurement)
+
+        return order
+
+    def evaluate(self, *measurements):
+        """
+        Calculates the given measurements, evaluating each node of the
+        dependency graph at most once. Values are cached until the cache is
+        invalidated, so the returned values must not be modified.
+
+        :param measurements: The measurements to calculate.
+        :return: A dict of the measurement names and their values.
+        """
+        values = self._cache
+
+        for measurement in self.get_evaluation_order(*measurements):
+            if measurement in values:
+                continue
+
+            values[measurement] = self._calculate(measurement, values,
+                                                  slice(None))
+
+        return {measurement: values[measurement]
+                for measurement in measurements}
+
+    def _calculate(self, measurement, values, window):
+        """
+        Calculates a measurement for the points within a window, using the
+        given values of its dependencies.
+
+        :param measurement: The measurement to calculate.
+        :param values: The values of the measurement's dependencies.
+        :param window: The slice of points to calculate.
+        :return: The values of the measurement within the window.
+        """
+        dependencies, calculate = self._measurements[measurement]
+
+        if len(dependencies) == 0:
+            return calculate(window)
+
+        if window == slice(None):
+            return calculate(*(values[dependency]
+                               for dependency in dependencies))
+
+        # Calculate over a padded window, so that the values within the
+        # window have all of the neighbouring points that they need
+        radius = self._radii.get(measurement, 0)
+        length = len(values[dependencies[0]])
+        start = max(window.start - radius, 0)
+        stop = min(window.stop + radius, length)
+
+        padded = calculate(*(values[dependency][start:stop]
+                             for dependency in dependencies))
+
+        return padded[window.start - start:window.stop - start]
+
+    def points_changed(self, index, change):
+        """
+        Updates the cached values after a single point has changed,
+        recalculating only the values that the change affects.
+
+        :param index: The index of the point that changed (for a removal,
+        the index that the point was at).
+        :param change: One of 'insert', 'update' or 'remove'.
+        :return: The (start, stop) indices of the values that changed.
+        """
+        if len(self._cache) == 0:
+            return index, index
+
+        values = {}
+        changed = {}
+
+        for measurement in self.get_evaluation_order(*self._cache):
+            if change == 'insert':
+                value = np.insert(self._cache[measurement], index, 0)
+            elif change == 'remove':
+                value = np.delete(self._cache[measurement], index)
+            else:
+                value = self._cache[measurement].copy()
+
+            dependencies = self.get_dependencies(measurement)
+
+            if len(dependencies) == 0:
+                if change == 'remove':
+                    start, stop = index, index
+                else:
+                    start, stop = index, index + 1
+            else:
+                radius = self._radii.get(measurement, 0)
+                start = max(min(changed[dependency][0]
+                                for dependency in dependencies) - radius, 0)
+                stop = min(max(changed[dependency][1]
+                               for dependency in dependencies) + radius,
+                           len(value))
+
+            if stop > start:
+                value[start:stop] = self._calculate(measurement, values,
+                                                    slice(start, stop))
+
+            values[measurement] = value
+            changed[measurement] = (start, stop)
+
+        self._cache = values
+
+        return (min(start for start, _ in changed.values()),
+                max(stop for _, stop in changed.values()))
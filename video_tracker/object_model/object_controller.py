@@ -3,15 +3,30 @@ try:
     from object_model.object_model import ObjectModel
     from object_model.object_display import ObjectDisplay
     from object_model.object_selector import ObjectSelector
+    from object_model.object_registry import ObjectRegistry
+    from object_model.derivatives import DEFAULT_SCHEME, validate_scheme
+    from object_model.update_scheduler import UpdateScheduler, POINTS, \
+        CALIBRATION, COLUMNS, OBJECTS, POSITION
 except ImportError:
     from object_model import ObjectModel
     from object_display import ObjectDisplay
     from object_selector import ObjectSelector
+    from object_registry import ObjectRegistry
+    from derivatives import DEFAULT_SCHEME, validate_scheme
+    from update_scheduler import UpdateScheduler, POINTS, CALIBRATION, \
+        COLUMNS, OBJECTS, POSITION
 
 import csv
+import json
+import os
+from functools import reduce
+
+import numpy as np
 
 # Constants
-NUM_POINTS_TO_DISPLAY = 10
+DEFAULT_TRAIL_BEFORE = 10  # Frames of trail to show before the current frame
+DEFAULT_TRAIL_AFTER = 10  # Frames of trail to show after the current frame
+EXPORT_CHUNK_SIZE = 10000  # Rows
 
 
 # Exceptions
@@ -19,11 +34,52 @@ class UnknownFileTypeError(Exception):
     pass
 
 
+# Functions
+def _format_row(row, integer_columns):
+    """
+    Prepares a row of values for writing, leaving missing (NaN) values blank.
+
+    :param row: A list of the values in the row.
+    :param integer_columns: The indices of the columns that hold integers.
+    """
+    row = ['' if value != value else value for value in row]
+    for column in integer_columns:
+        if row[column] != '':
+            row[column] = int(row[column])
+    return row
+
+
+def _get_metadata_file_name(file_name):
+    """
+    Returns the path of the JSON file that describes the columns of an
+    exported .npy file.
+    """
+    return file_name + '.json'
+
+
+def _get_unique_names(names):
+    """
+    Returns the names with a number appended to any that repeat an earlier
+    name, so that they can be used as keys.
+    """
+    unique_names = []
+    for name in names:
+        unique_name = name
+        number = 2
+        while unique_name in unique_names:
+            unique_name = f'{name} #{number}'
+            number += 1
+        unique_names.append(unique_name)
+    return unique_names
+
+
 # Classes
 class ObjectController:
     # Controller
-    def __init__(self, overlay_controller, video_controller):
-        self._objects = []
+    def __init__(self, overlay_controller, video_controller,
+                 update_scheduler=UpdateScheduler,
+                 object_display=ObjectDisplay, object_selector=ObjectSelector):
+        self._objects = ObjectRegistry()
         self._overlay_controller = overlay_controller
         self._video_controller = video_controller
 
@@ -31,17 +87,38 @@ class ObjectController:
 
         self._current_object_id = 1
 
-        self._object_display = ObjectDisplay(self)
+        self._derivative_scheme = DEFAULT_SCHEME
+
+        self._trail_before = DEFAULT_TRAIL_BEFORE
+        self._trail_after = DEFAULT_TRAIL_AFTER
+
+        self._update_scheduler = update_scheduler(self._flush_updates)
+
+        # The changes to the current object's points since the display was
+        # last updated
+        self._point_changes = []
+
+        self._object_display = object_display(self)
 
         # TODO: Change where object selector is
-        self._object_selector = ObjectSelector(self, self._overlay_controller)
+        self._object_selector = object_selector(self, self._overlay_controller)
+
+        for listener in (self._object_selector, self._object_display,
+                         self._overlay_controller):
+            self._objects.add_listener(listener)
 
     def get_object_names(self):
         """
         Returns a list of all of the names of the objects.
         """
-        object_names = [o.get_name() for o in self._objects]
-        return object_names
+        return self._objects.get_names()
+
+    def get_object_id(self, object_name):
+        """
+        Returns the id of the object with the specified name (see
+        ObjectModel.get_id).
+        """
+        return self._get_object_by_name(object_name).get_id()
 
     def get_all_possible_measurements(self):
         possible_measurements = {}
@@ -77,11 +154,46 @@ class ObjectController:
 
     def perform_update(self):
         """
-        Updates the object display, selector and the overlay controller.
+        Updates the object display, selector and the overlay controller (once
+        control returns to the event loop).
+        """
+        self.invalidate(OBJECTS)
+
+    def invalidate(self, *flags, throttle=False):
+        """
+        Records what has changed, so that the affected views are updated
+        once control returns to the event loop.
+
+        :param flags: What has changed (see update_scheduler)
+        :param throttle: Whether the update can be delayed to keep within the
+        frame budget.
         """
-        self._object_display.update()
-        self._object_selector.update()
-        self._overlay_controller.update()
+        self._update_scheduler.invalidate(*flags, throttle=throttle)
+
+    def _flush_updates(self, flags):
+        """
+        Updates each view affected by the changes, at most once.
+
+        :param flags: The set of everything that has changed.
+        """
+        point_changes = self._point_changes
+        self._point_changes = []
+
+        if flags & {CALIBRATION, OBJECTS}:
+            self._object_display.update()
+        else:
+            if POINTS in flags:
+                self._object_display.points_changed(point_changes)
+            if COLUMNS in flags:
+                self._object_display.update_table()
+
+        if OBJECTS in flags:
+            self._object_selector.update()
+
+        # e.g. tracking a point and then moving on to the next frame only
+        # redraws the overlay once
+        if flags & {POINTS, OBJECTS, POSITION}:
+            self._overlay_controller.position_changed()
 
     def create_object(self):
         """
@@ -89,12 +201,20 @@ class ObjectController:
 
         :return: The created object.
         """
+        # Skip any names already taken (e.g. by renaming an object)
+        while 'Object #' + str(self._current_object_id) in self._objects:
+            self._current_object_id += 1
+
         object_ = ObjectModel(self,
-                              name='Object #' + str(self._current_object_id))
-        self._objects.append(object_)
+                              name='Object #' + str(self._current_object_id),
+                              object_id=self._current_object_id)
+        self._objects.add(object_)
 
         self._current_object_id += 1
 
+        if self.get_current_object() is None:
+            self._current_object_name = object_.get_name()
+
         self.perform_update()
 
         return object_
@@ -113,11 +233,37 @@ class ObjectController:
         if perform_update:
             self.perform_update()
 
+    def remove_object(self, object_name):
+        """
+        Removes the object with the specified name. If it was the current
+        object, the first remaining object becomes the current object.
+
+        :param object_name: The name of the object to remove.
+        """
+        self._objects.remove(object_name)
+
+        if object_name == self._current_object_name:
+            names = self._objects.get_names()
+            self._current_object_name = names[0] if len(names) > 0 else None
+
+        self.perform_update()
+
+    def rename_object(self, old_name, new_name):
+        """
+        Renames an object.
+
+        :param old_name: The current name of the object.
+        :param new_name: The new name of the object.
+        """
+        self._objects.rename(old_name, new_name)
+
+        if old_name == self._current_object_name:
+            self._current_object_name = new_name
+
+        self.perform_update()
+
     def _get_object_by_name(self, name):
-        for o in self._objects:
-            if o.get_name() == name:
-                return o
-        return None
+        return self._objects.get(name)
 
     def get_current_object(self):
         """
@@ -138,6 +284,13 @@ class ObjectController:
         self.get_current_object().add_point(
             x, y, self._video_controller.get_current_position())
 
+    def untrack_current_object(self):
+        """
+        Removes the current object's point at the current time (if any).
+        """
+        self.get_current_object().remove_point(
+            self._video_controller.get_current_position())
+
     def get_ruler_length(self):
         """
         Returns the actual length, specified length and unit of the ruler.
@@ -156,34 +309,155 @@ class ObjectController:
         """
         return self._overlay_controller.get_origin_pos()
 
+    def get_calibration_version(self):
+        """
+        Returns the calibration versions of the overlay and video controllers,
+        which change whenever the conversion from pixels and frames to
+        measurements does.
+        """
+        return (self._overlay_controller.get_calibration_version(),
+                self._video_controller.get_calibration_version())
+
+    def get_derivative_scheme(self):
+        """
+        Returns the scheme used to calculate velocities and accelerations.
+        """
+        return self._derivative_scheme
+
+    def set_derivative_scheme(self, scheme):
+        """
+        Sets the scheme used to calculate velocities and accelerations.
+
+        :param scheme: The new scheme (one of DERIVATIVE_SCHEMES)
+        """
+        validate_scheme(scheme)
+        self._derivative_scheme = scheme
+        self.invalidate(CALIBRATION)
+
+    def get_trail_window(self):
+        """
+        Returns how many frames before and after the current frame have their
+        points displayed.
+        """
+        return self._trail_before, self._trail_after
+
+    def set_trail_window(self, before, after):
+        """
+        Sets how many frames before and after the current frame have their
+        points displayed.
+
+        :param before: The number of frames before the current frame.
+        :param after: The number of frames after the current frame.
+        """
+        self._trail_before = before
+        self._trail_after = after
+        self._overlay_controller.position_changed()
+
     def get_points_to_display(self):
         """
-        Returns a list of points to display, for each object.
+        Returns a list of points to display, for each object. These are the
+        points within the trail window around the current frame.
         """
+        current_frame = self._video_controller.get_current_position('frames')
+        first = current_frame - self._trail_before
+        last = current_frame + self._trail_after
+
         points = []
         for object in self._objects:
             points.append(
-                {'points': object.get_last_n_points(NUM_POINTS_TO_DISPLAY)})
+                {'name': object.get_name(),
+                 'points': object.get_points_between(first, last)})
         return points
 
-    def get_data(self, *args):
+    def position_changed(self):
+        """
+        Updates the displayed points when the current frame changes (once
+        control returns to the event loop).
+        """
+        self.invalidate(POSITION)
+
+    def get_measurement_arrays(self, *args):
         """
-        Returns the data from the current object for the specified parameters.
+        Returns the frames and measurement arrays from the current object for
+        the specified parameters (see ObjectModel.get_measurement_arrays).
 
         :param args: The parameters to get data for (e.g. 'x', 'vy', 'a')
         """
         current_object = self.get_current_object()
         if current_object is None:
             return None
-        return current_object.get_data(*args)
+        return current_object.get_measurement_arrays(*args)
+
+    def get_measurement_arrays_per_object(self, object_names, *args):
+        """
+        Returns the frames and measurement arrays of each of the given
+        objects, for the specified parameters.
+
+        :param object_names: The names of the objects.
+        :param args: The parameters to get data for (e.g. 'x', 'vy', 'a')
+        :return: A dict of object name -> (frames, dict of parameter -> array)
+        """
+        return {name: self._get_object_by_name(name).get_measurement_arrays(
+            *args) for name in object_names}
+
+    def get_data_versions(self, object_names):
+        """
+        Returns a value for each object that changes whenever its measurements
+        do (i.e. when its points, the calibration or the derivative scheme
+        change).
+
+        :param object_names: The names of the objects.
+        :return: A dict of object name -> version.
+        """
+        calibration = (self.get_calibration_version(),
+                       self._derivative_scheme)
+        return {name: (self._get_object_by_name(name).get_points_version(),
+                       calibration) for name in object_names}
 
-    def update(self):  # TODO: Reconcile the perform_update and update methods.
+    def points_changed(self, object_, index, change, start, stop):
         """
-        Updates the object controller.
+        Updates the object display after one of an object's points has
+        changed.
+
+        :param object_: The object whose point changed.
+        :param index: The index of the point that changed (for a removal,
+        the index that the point was at).
+        :param change: One of 'insert', 'update' or 'remove'.
+        :param start: The first index whose measurements changed.
+        :param stop: The index after the last one whose measurements changed.
         """
-        self._object_display.update()
+        if object_ is self.get_current_object():
+            self._point_changes.append((index, change, start, stop))
+        self.invalidate(POINTS)
 
-    def export_to_file(self, data_to_export, file_name, format_):
+    def calibration_changed(self, preview=False):
+        """
+        Updates the object display after the ruler, reference axes or timing
+        have changed.
+
+        :param preview: Whether the change is part of a drag, in which case
+        the display is only updated as often as the frame budget allows.
+        """
+        self.invalidate(CALIBRATION, throttle=preview)
+
+    def columns_changed(self):
+        """
+        Updates the table after its columns have changed.
+        """
+        self.invalidate(COLUMNS)
+
+    def _iter_export_chunks(self, data_to_export, chunk_size):
+        """
+        Joins the measurements of the objects on their frame numbers, a chunk
+        of rows at a time.
+
+        :param data_to_export: A list of (object name, measurement) pairs,
+        one for each column.
+        :param chunk_size: The (maximum) number of rows in each chunk.
+        :return: The total number of rows, which columns hold integer values,
+        and a generator of 2D arrays of the values (NaN where an object has
+        no value at a frame), one for each chunk.
+        """
         # Determine the data to get from the models
         data_per_object = {}
         for o, measurement in data_to_export:
@@ -193,78 +467,235 @@ class ObjectController:
 
         # Get the data from the models
         export_data = {
-            o: self._get_object_by_name(o).get_data(*data_per_object[o])
+            o: self._get_object_by_name(o).get_measurement_arrays(
+                *data_per_object[o])
             for o in data_per_object.keys()
         }
 
-        # Put the data into a tabular format, more suitable for exporting
-        object_measurement_to_column = {x: i for i, x in
-                                        enumerate(data_to_export)}
+        all_frames = reduce(np.union1d,
+                            (frames for frames, _ in export_data.values()),
+                            np.zeros(0, dtype=np.int64))
 
-        all_times = set()
-        for o, data in export_data.items():
-            all_times |= set(data.keys())
+        integer_columns = [
+            column for column, (o, measurement) in enumerate(data_to_export)
+            if np.issubdtype(export_data[o][1][measurement].dtype, np.integer)]
 
-        all_times = sorted(list(all_times))
+        def chunks():
+            for start in range(0, len(all_frames), chunk_size):
+                chunk_frames = all_frames[start:start + chunk_size]
+                table = np.full((len(chunk_frames), len(data_to_export)),
+                                np.nan)
 
-        final_data = []
+                # Scatter each object's values in this chunk into the rows of
+                # their frames
+                for o, (frames, values) in export_data.items():
+                    first = np.searchsorted(frames, chunk_frames[0])
+                    last = np.searchsorted(frames, chunk_frames[-1], 'right')
+                    rows = np.searchsorted(chunk_frames, frames[first:last])
 
-        for time in all_times:
-            final_data.append([None] * len(data_to_export))
+                    for column, (name, measurement) in \
+                            enumerate(data_to_export):
+                        if name == o:
+                            table[rows, column] = \
+                                values[measurement][first:last]
 
-            for o, data in export_data.items():
-                try:
-                    time_data = data[time]
-                except KeyError:
-                    continue
+                yield table
 
-                for measurement, value in time_data.items():
-                    final_data[-1][
-                        object_measurement_to_column[(o, measurement)]] = value
+        return len(all_frames), integer_columns, chunks()
+
+    def _get_export_columns(self, data_to_export):
+        """
+        Returns the names (measurement and object) and units of the columns.
 
-        # Get the units of the measurements
-        units = {}
+        :param data_to_export: A list of (object name, measurement) pairs.
+        :return: A list of the column names, and a list of their units (None
+        if a measurement has no unit).
+        """
+        names = []
+        units = []
         for name, measurement in data_to_export:
-            object_ = self._get_object_by_name(name)
+            names.append(measurement + ' (' + name + ')')
+            units.append(self._get_object_by_name(name).get_unit(measurement))
+        return names, units
 
-            units[(name, measurement)] = object_.get_unit(measurement)
+    def _write_csv(self, file_name, names, units, num_rows, integer_columns,
+                   chunks):
+        """
+        Writes the chunks of rows to a CSV file, with a header row.
 
-        # Add headers
+        :return: The number of rows written.
+        """
         headers = []
-        for x in data_to_export:
-            header = x[1]+' ('+x[0]+')'
-            if units[x] is not None:
-                header += ' ['+units[x]+']'
-            headers.append(header)
-        final_data.insert(0, headers)
-
-        # Write the data to a file
-        if format_ == 'csv':
-            with open(file_name, 'w', newline='') as f:
-                csv_writer = csv.writer(f)
-                csv_writer.writerows(final_data)
-        else:
-            raise UnknownFileTypeError(f'{format_} is not a known file type '
-                                       f'(acceptable: csv)')
+        for name, unit in zip(names, units):
+            if unit is not None:
+                name += ' [' + unit + ']'
+            headers.append(name)
+
+        rows_written = 0
+        with open(file_name, 'w', newline='') as f:
+            csv_writer = csv.writer(f)
+            csv_writer.writerow(headers)
+
+            for table in chunks:
+                csv_writer.writerows(_format_row(row, integer_columns)
+                                     for row in table.tolist())
+                rows_written += len(table)
 
-    def get_time(self, frame):
-        return self._video_controller.get_time(frame)
+        return rows_written
+
+    def _write_npz(self, file_name, names, units, num_rows, integer_columns,
+                   chunks):
+        """
+        Writes each column to a NumPy archive as a float64 array (named after
+        the column), along with the 'columns' and 'units' of the columns. If
+        two columns have the same name, the later one is numbered.
+
+        :return: The number of rows written.
+        """
+        table = np.empty((num_rows, len(names)))
+
+        rows_written = 0
+        for chunk in chunks:
+            table[rows_written:rows_written + len(chunk)] = chunk
+            rows_written += len(chunk)
+
+        if rows_written < num_rows:  # Cancelled, so don't write anything
+            return rows_written
+
+        names = _get_unique_names(names)
+        columns = {name: table[:, i] for i, name in enumerate(names)}
+        columns['columns'] = np.array(names, dtype=str)
+        columns['units'] = np.array(
+            ['' if unit is None else unit for unit in units], dtype=str)
+
+        with open(file_name, 'wb') as f:
+            np.savez(f, **columns)
+
+        return rows_written
+
+    def _write_npy(self, file_name, names, units, num_rows, integer_columns,
+                   chunks):
+        """
+        Writes the rows to a 2D float64 .npy file (which can be memory-mapped),
+        with the names and units of its columns in a JSON file alongside it.
+
+        :return: The number of rows written.
+        """
+        with open(_get_metadata_file_name(file_name), 'w') as f:
+            json.dump({'columns': names, 'units': units}, f)
+
+        table = np.lib.format.open_memmap(file_name, mode='w+',
+                                          dtype=np.float64,
+                                          shape=(num_rows, len(names)))
+
+        rows_written = 0
+        for chunk in chunks:
+            table[rows_written:rows_written + len(chunk)] = chunk
+            rows_written += len(chunk)
+
+        table.flush()
+        del table
+
+        return rows_written
+
+    def export_to_file(self, data_to_export, file_name, format_,
+                       progress=None, chunk_size=EXPORT_CHUNK_SIZE):
+        """
+        Exports the given measurements of the objects to a file, writing the
+        rows a chunk at a time.
+
+        :param data_to_export: A list of (object name, measurement) pairs,
+        one for each column.
+        :param file_name: The path of the file to write.
+        :param format_: The format of the file (csv, npz or npy).
+        :param progress: An optional function that is called with the number
+        of rows written and the total number of rows after each chunk. If it
+        returns False, the export is cancelled and any existing file is left
+        as it was.
+        :param chunk_size: The number of rows to write at a time.
+        :return: Whether the export was completed.
+        """
+        writers = {
+            'csv': self._write_csv,
+            'npz': self._write_npz,
+            'npy': self._write_npy,
+        }
+
+        if format_ not in writers:
+            raise UnknownFileTypeError(f'{format_} is not a known file type '
+                                       f'(acceptable: '
+                                       f'{", ".join(writers.keys())})')
+
+        num_rows, integer_columns, chunks = self._iter_export_chunks(
+            data_to_export, chunk_size)
+        names, units = self._get_export_columns(data_to_export)
+
+        def report_progress():
+            rows_written = 0
+            for table in chunks:
+                yield table
+                rows_written += len(table)
+                if progress is not None and \
+                        progress(rows_written, num_rows) is False:
+                    return
+
+        # Write the data to a temporary file alongside the file, which only
+        # replaces it (and its metadata file) once the export is complete
+        temporary_file = f'{file_name}.{os.getpid()}.tmp'
+
+        paths = ((temporary_file, file_name),
+                 (_get_metadata_file_name(temporary_file),
+                  _get_metadata_file_name(file_name)))
+
+        try:
+            rows_written = writers[format_](temporary_file, names, units,
+                                            num_rows, integer_columns,
+                                            report_progress())
+
+            completed = rows_written >= num_rows
+            if completed:
+                for temporary_path, path in paths:
+                    if os.path.exists(temporary_path):
+                        os.replace(temporary_path, path)
+        finally:
+            for temporary_path, _ in paths:
+                if os.path.exists(temporary_path):
+                    os.remove(temporary_path)
+
+        return completed
+
+    def get_times(self, frames):
+        """
+        Returns an array of the times (s) of an array of frame numbers.
+        """
+        return self._video_controller.get_times(frames)
 
     def load(self, data):
-        for _ in range(len(data['objects']) - 1):
-            self.create_object()
+        for name in self._objects.get_names():
+            self._objects.remove(name)
 
-        for i, o in enumerate(self._objects):
-            o.load(data['objects'][i])
+        for i, object_data in enumerate(data['objects']):
+            # Projects saved before objects had ids are numbered in order
+            object_ = ObjectModel(self, object_id=i + 1)
+            object_.load(object_data)
+            self._objects.add(object_)
 
         self._current_object_name = data['current_object_name']
         self._current_object_id = data['current_object_id']
+        self._derivative_scheme = data.get('derivative_scheme',
+                                           DEFAULT_SCHEME)
+        self._trail_before = data.get('trail_before', DEFAULT_TRAIL_BEFORE)
+        self._trail_after = data.get('trail_after', DEFAULT_TRAIL_AFTER)
         self._object_display.load(data['object_display'])
+        self.invalidate(OBJECTS)
 
     def dump(self):
         return {
             'current_object_name': self._current_object_name,
             'current_object_id': self._current_object_id,
+            'derivative_scheme': self._derivative_scheme,
+            'trail_before': self._trail_before,
+            'trail_after': self._trail_after,
             'objects': [o.dump() for o in self._objects],
             'object_display': self._object_display.dump(),
         }
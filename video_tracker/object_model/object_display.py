@@ -51,11 +51,38 @@ class ObjectDisplay(QSplitter):
         """
         self._object_graph.initialise_graph()
 
-    def get_data(self, *args):
+    def get_object_names(self):
         """
-        Returns the data from the object controller.
+        Returns the names of all of the objects.
         """
-        return self._object_controller.get_data(*args)
+        return self._object_controller.get_object_names()
+
+    def get_object_id(self, object_name):
+        """
+        Returns the id of an object from the object controller.
+        """
+        return self._object_controller.get_object_id(object_name)
+
+    def get_data_versions(self, object_names):
+        """
+        Returns the versions of the data of the given objects (see
+        ObjectController.get_data_versions).
+        """
+        return self._object_controller.get_data_versions(object_names)
+
+    def get_measurement_arrays_per_object(self, object_names, *args):
+        """
+        Returns the measurement arrays of several objects from the object
+        controller.
+        """
+        return self._object_controller.get_measurement_arrays_per_object(
+            object_names, *args)
+
+    def get_measurement_arrays(self, *args):
+        """
+        Returns the measurement arrays from the object controller.
+        """
+        return self._object_controller.get_measurement_arrays(*args)
 
     def update(self):
         """
@@ -64,6 +91,46 @@ class ObjectDisplay(QSplitter):
         self._object_graph.update()
         self._object_table.update()
 
+    def update_table(self):
+        """
+        Updates just the table.
+        """
+        self._object_table.update()
+
+    def points_changed(self, changes):
+        """
+        Updates the parts of the graph and rows of the table affected by
+        changes to the points.
+
+        :param changes: A list of (index, change, start, stop) for each change
+        (see ObjectController.points_changed)
+        """
+        self._object_graph.points_changed(changes)
+        self._object_table.points_changed(changes)
+
+    def columns_changed(self):
+        """
+        Schedules an update of the table after its columns have changed.
+        """
+        self._object_controller.columns_changed()
+
+    def object_added(self, name):
+        """
+        New objects are plotted when the display is next updated.
+        """
+
+    def object_removed(self, name):
+        """
+        Stops plotting a removed object.
+        """
+        self._object_graph.object_removed(name)
+
+    def object_renamed(self, old_name, new_name):
+        """
+        Updates the graph after an object was renamed.
+        """
+        self._object_graph.object_renamed(old_name, new_name)
+
     def load(self, data):
         self._object_graph.load(data['graph'])
         self._object_table.load(data['table'])
@@ -1,10 +1,21 @@
 # Imports
+try:
+    from object_model.graph_series import GraphSeries
+except ImportError:
+    from graph_series import GraphSeries
+
 from pyqtgraph import PlotWidget
 import pyqtgraph
 
 from PyQt5.QtWidgets import QMenu
 from PyQt5.QtCore import QPoint
 
+# Constants
+OBJECTS_MENU = 'Objects'
+CURRENT_OBJECT_ACTION = 'Current object only'
+ALL_OBJECTS_ACTION = 'All objects'
+ALL_OBJECTS = 'all'  # Plot all of the objects, including new ones
+
 
 # pyqtgraph configuration
 pyqtgraph.setConfigOption('background', 'w')  # White background
@@ -13,10 +24,11 @@ pyqtgraph.setConfigOption('foreground', 'k')  # Black foreground
 
 # Classes
 class ObjectGraph(PlotWidget):
-    def __init__(self, object_display):
+    def __init__(self, object_display, graph_series=GraphSeries):
         super().__init__()
 
         self._object_display = object_display
+        self._graph_series = graph_series
 
         self._y_measurement = None
         self._x_measurement = None
@@ -28,7 +40,21 @@ class ObjectGraph(PlotWidget):
             axis['item'].label.mousePressEvent = \
                 lambda event, n=name: self._axis_label_clicked(n, event)
 
-        self._plot_data = self.plotItem.plot()
+        # Which objects to plot: None for just the current object,
+        # ALL_OBJECTS, or a list of the names of the objects
+        self._plotted_objects = None
+
+        self._series = {}  # Object name -> GraphSeries
+        self._data_versions = {}  # Object name -> version of its plotted data
+        self._plotted_measurements = None
+
+        self.plotItem.getViewBox().sigXRangeChanged.connect(
+            self._update_symbols)
+
+        self._objects_menu = QMenu(OBJECTS_MENU)
+        self._objects_menu.aboutToShow.connect(self._update_objects_menu)
+        self._objects_menu.triggered.connect(self._objects_menu_triggered)
+        self.plotItem.getViewBox().menu.addMenu(self._objects_menu)
 
     def _axis_label_clicked(self, name, event):
         """
@@ -59,37 +85,223 @@ class ObjectGraph(PlotWidget):
 
             self._set_measurement(name, selected)
 
-    def _replot_data(self):
+    def _get_plotted_names(self):
+        """
+        Returns the names of the objects to plot.
+        """
+        if self._plotted_objects is None:
+            current_object = self._object_display.get_current_object()
+            if current_object is None:
+                return []
+            return [current_object.get_name()]
+
+        object_names = self._object_display.get_object_names()
+        if self._plotted_objects == ALL_OBJECTS:
+            return object_names
+        return [name for name in object_names
+                if name in self._plotted_objects]
+
+    def _create_series(self, name):
+        """
+        Creates the series to plot an object with. When several objects are
+        plotted, each has its own colour (which stays the same when other
+        objects are removed).
+        """
+        if self._plotted_objects is None:
+            return self._graph_series(self.plotItem)
+
+        if self.plotItem.legend is None:
+            self.plotItem.addLegend()
+
+        colour = pyqtgraph.intColor(self._object_display.get_object_id(name))
+        return self._graph_series(self.plotItem, colour, colour, name)
+
+    def _remove_legend(self):
+        """
+        Removes the legend (if there is one), as it is only shown when several
+        objects can be plotted.
+        """
+        legend = self.plotItem.legend
+        if legend is None:
+            return
+
+        if legend.scene() is not None:
+            legend.scene().removeItem(legend)
+        self.plotItem.legend = None
+
+    def _remove_series(self, names_to_keep=()):
+        """
+        Removes the series of all of the objects that aren't being kept.
+        """
+        for name in list(self._series.keys()):
+            if name not in names_to_keep:
+                self._series.pop(name).remove()
+                self._data_versions.pop(name, None)
+
+    def _replot_data(self, start=0, replot_all=True):
         """
-        Replots all of the data in the graph.
+        Replots the data in the graph.
+
+        :param start: The index of the first of the current object's points
+        that has changed since its data was last plotted.
+        :param replot_all: Whether to replot the data of all of the objects,
+        rather than just the objects whose data has changed.
         """
         if self._y_measurement is None or self._x_measurement is None:
             return
 
-        data = self._object_display.get_data(self._x_measurement,
-                                             self._y_measurement)
+        measurements = (self._x_measurement, self._y_measurement)
+        if measurements != self._plotted_measurements:
+            self._plotted_measurements = measurements
+            replot_all = True
+
+        names = self._get_plotted_names()
+        self._remove_series(names)
+
+        versions = self._object_display.get_data_versions(names)
+        changed = [name for name in names if replot_all or
+                   versions[name] != self._data_versions.get(name)]
+
+        if len(changed) == 0:
+            return
+
+        data = self._object_display.get_measurement_arrays_per_object(
+            changed, self._x_measurement, self._y_measurement)
+
+        current_object = self._object_display.get_current_object()
+        current_name = None if current_object is None \
+            else current_object.get_name()
+
+        for name in changed:
+            if name not in self._series:
+                self._series[name] = self._create_series(name)
+
+            _, values = data[name]
+            self._series[name].plot(
+                values[self._x_measurement], values[self._y_measurement],
+                start if not replot_all and name == current_name else 0)
+            self._data_versions[name] = versions[name]
+
+        self._update_symbols()
+
+    def _update_symbols(self, *args):
+        """
+        Only draws symbols for the points if they aren't too dense in the
+        current view.
+        """
+        (left, right), _ = self.plotItem.getViewBox().viewRange()
+        width = self.plotItem.getViewBox().width()
+        for series in self._series.values():
+            series.update_symbols(left, right, width)
+
+    def points_changed(self, changes):
+        """
+        Replots only the objects whose points have changed, and of the
+        current object only the points affected by the changes (e.g. just
+        appending a new point to the end).
+
+        :param changes: A list of (index, change, start, stop) for each change
+        to the current object (see ObjectController.points_changed)
+        """
+        start = min((min(index, start) for index, _, start, _ in changes),
+                    default=0)
+        self._replot_data(start, False)
+
+    def object_removed(self, name):
+        """
+        Stops plotting an object that was removed.
+        """
+        if isinstance(self._plotted_objects, list) and \
+                name in self._plotted_objects:
+            self._plotted_objects.remove(name)
+        self._remove_series([other for other in self._series
+                             if other != name])
+
+    def object_renamed(self, old_name, new_name):
+        """
+        Keeps plotting an object under its new name.
+        """
+        if isinstance(self._plotted_objects, list) and \
+                old_name in self._plotted_objects:
+            self._plotted_objects[self._plotted_objects.index(old_name)] = \
+                new_name
+
+        # The series is replotted (with the new name in the legend) when the
+        # graph is next updated
+        self._remove_series([other for other in self._series
+                             if other != old_name])
+
+    def set_plotted_objects(self, objects):
+        """
+        Sets which objects are plotted.
+
+        :param objects: None for just the current object, ALL_OBJECTS, or a
+        list of the names of the objects.
+        """
+        self._plotted_objects = objects
+
+        # Each object's colour depends on the mode, so start again
+        self._remove_series()
+        if objects is None:
+            self._remove_legend()
+        self._replot_data()
+
+    def _update_objects_menu(self):
+        """
+        Fills the objects menu with the modes and each of the objects.
+        """
+        self._objects_menu.clear()
+
+        current_action = self._objects_menu.addAction(CURRENT_OBJECT_ACTION)
+        current_action.setCheckable(True)
+        current_action.setChecked(self._plotted_objects is None)
+
+        all_action = self._objects_menu.addAction(ALL_OBJECTS_ACTION)
+        all_action.setCheckable(True)
+        all_action.setChecked(self._plotted_objects == ALL_OBJECTS)
+
+        self._objects_menu.addSeparator()
 
-        x = []
-        y = []
+        plotted = self._get_plotted_names() \
+            if self._plotted_objects is not None else []
 
-        for time, thing in sorted(data.items()):
-            if self._x_measurement in thing and \
-                    self._y_measurement in thing:
-                if thing[self._x_measurement] is None or \
-                        thing[self._y_measurement] is None:
-                    continue
-                x.append(thing[self._x_measurement])
-                y.append(thing[self._y_measurement])
+        for name in self._object_display.get_object_names():
+            action = self._objects_menu.addAction(name)
+            action.setCheckable(True)
+            action.setChecked(name in plotted)
+            action.setData(name)
 
-        self._plot_data.setData(x, y, symbol='o', symbolBrush='k')
+    def _objects_menu_triggered(self, action):
+        """
+        Changes which objects are plotted to match the chosen action.
+        """
+        name = action.data()
+
+        if name is None:
+            if action.text() == ALL_OBJECTS_ACTION:
+                self.set_plotted_objects(ALL_OBJECTS)
+            else:
+                self.set_plotted_objects(None)
+            return
 
-    def _set_measurement(self, side, measurement):
+        plotted = self._get_plotted_names() \
+            if self._plotted_objects is not None else []
+
+        if name in plotted:
+            plotted.remove(name)
+        else:
+            plotted.append(name)
+
+        self.set_plotted_objects(plotted)
+
+    def _set_measurement(self, side, measurement, replot=True):
         """
         Sets the measurement that will be used on a particular axis of
         the graph. Also triggers a replot of the data.
 
         :param side: Which axis to change (left or bottom)
         :param measurement: The new measurement to use
+        :param replot: Whether to replot the data.
         """
         measurements = self._object_display. \
             get_current_object_available_measurements()
@@ -104,7 +316,8 @@ class ObjectGraph(PlotWidget):
         elif side == 'bottom':
             self._x_measurement = measurement
 
-        self._replot_data()
+        if replot:
+            self._replot_data()
 
     def initialise_graph(self):
         """
@@ -116,10 +329,11 @@ class ObjectGraph(PlotWidget):
 
     def _update_axes(self):
         """
-        Updates the axes to be what is stored.
+        Updates the axes to be what is stored, and replots the data once.
         """
-        self._set_measurement('left', self._y_measurement)
-        self._set_measurement('bottom', self._x_measurement)
+        self._set_measurement('left', self._y_measurement, False)
+        self._set_measurement('bottom', self._x_measurement, False)
+        self._replot_data(replot_all=False)
 
     def update(self):
         """
@@ -130,10 +344,14 @@ class ObjectGraph(PlotWidget):
     def load(self, data):
         self._x_measurement = data['x']
         self._y_measurement = data['y']
-        self.update()
+        self._plotted_objects = data.get('objects')
+        self._remove_series()
+        if self._plotted_objects is None:
+            self._remove_legend()
 
     def dump(self):
         return {
             'x': self._x_measurement,
             'y': self._y_measurement,
+            'objects': self._plotted_objects,
         }
@@ -1,5 +1,15 @@
 # Imports
-from math import sin, cos, radians, sqrt
+import numpy as np
+
+try:
+    from object_model.point_store import PointStore
+    from object_model.measurement_engine import MeasurementEngine
+    from object_model.derivatives import calculate_derivative, get_radius, \
+        DEFAULT_SCHEME
+except ImportError:
+    from point_store import PointStore
+    from measurement_engine import MeasurementEngine
+    from derivatives import calculate_derivative, get_radius, DEFAULT_SCHEME
 
 
 # Exceptions
@@ -7,36 +17,96 @@ class InvalidMeasurementError(Exception):
     pass
 
 
+# Functions
+def _to_optional_list(values):
+    """
+    Converts an array of values to a list, replacing NaN with None.
+    """
+    return [None if value != value else value for value in values.tolist()]
+
+
 # Classes
 class ObjectModel:
     # Model
-    def __init__(self, object_controller, points=None, name=''):
-        if points is None:
-            points = {}
-        self._points = points
+    def __init__(self, object_controller, points=None, name='', object_id=0):
+        self._points = PointStore(points)
+        self._points_version = 0
         self._object_controller = object_controller
         self._name = name
+        # Unlike the name, this never changes (e.g. for the object's colour)
+        self._id = object_id
 
+        # Each measurement is calculated from the measurements it depends on:
+        # name: (dependencies, calculation, unit)
         self._available_measurements = {
-            't': (self._get_t, self._get_time_unit),
-            'frame': (self._get_frame, lambda: None),
-            'x': (self._get_x, self._get_len_unit),
-            'y': (self._get_y, self._get_len_unit),
-            'r': (self._get_r, self._get_len_unit),
-            'vx': (self._get_vx, self._get_vel_unit),
-            'vy': (self._get_vy, self._get_vel_unit),
-            'v': (self._get_v, self._get_vel_unit),
-            'ax': (self._get_ax, self._get_acc_unit),
-            'ay': (self._get_ay, self._get_acc_unit),
-            'a': (self._get_a, self._get_acc_unit),
+            't': ((), self._get_t, self._get_time_unit),
+            'frame': ((), self._get_frame, lambda: None),
+            'x': (('px', 'py'), self._get_true_x, self._get_len_unit),
+            'y': (('px', 'py'), self._get_true_y, self._get_len_unit),
+            'r': (('x', 'y'), self._combine_values, self._get_len_unit),
+            'vx': (('pvx', 'pvy'), self._get_true_x_component,
+                   self._get_vel_unit),
+            'vy': (('pvx', 'pvy'), self._get_true_y_component,
+                   self._get_vel_unit),
+            'v': (('vx', 'vy'), self._combine_values, self._get_vel_unit),
+            'ax': (('pax', 'pay'), self._get_true_x_component,
+                   self._get_acc_unit),
+            'ay': (('pax', 'pay'), self._get_true_y_component,
+                   self._get_acc_unit),
+            'a': (('ax', 'ay'), self._combine_values, self._get_acc_unit),
+        }
+
+        # The positions and their derivatives in pixels, which the actual
+        # measurements are transformed from. These stay cached while the
+        # ruler or reference axes are moved, as they don't depend on them.
+        self._pixel_measurements = {
+            'px': ((), self._get_px),
+            'py': ((), self._get_py),
+            'pvx': (('px', 't'), self._calculate_derivative),
+            'pvy': (('py', 't'), self._calculate_derivative),
+            'pax': (('pvx', 't'), self._calculate_derivative),
+            'pay': (('pvy', 't'), self._calculate_derivative),
         }
 
+        measurements = {key: value[:2] for key, value in
+                        self._available_measurements.items()}
+        measurements.update(self._pixel_measurements)
+
+        # What each measurement is directly affected by (see _validate_cache)
+        key_groups = {key: () for key in measurements}
+        key_groups['t'] = ('time',)
+        for key in ('x', 'y', 'vx', 'vy', 'ax', 'ay'):
+            key_groups[key] = ('space',)
+        for key in ('pvx', 'pvy', 'pax', 'pay'):
+            key_groups[key] = ('scheme',)
+
+        self._engine = MeasurementEngine(measurements, None, key_groups)
+        self._set_derivative_radius(DEFAULT_SCHEME)
+
     def get_name(self):
         """
         Returns the name of the object.
         """
         return self._name
 
+    def set_name(self, name):
+        """
+        Sets the name of the object (see ObjectRegistry.rename).
+        """
+        self._name = name
+
+    def get_id(self):
+        """
+        Returns the number the object was given when it was created.
+        """
+        return self._id
+
+    def get_points_version(self):
+        """
+        Returns a number that changes whenever the points change.
+        """
+        return self._points_version
+
     def _get_time_unit(self):
         """
         Returns the unit of time (s).
@@ -62,7 +132,7 @@ class ObjectModel:
         return self._get_vel_unit() + '^2'
 
     def get_unit(self, measurement):
-        return self._available_measurements[measurement][1]()
+        return self._available_measurements[measurement][2]()
 
     def add_point(self, x, y, frame):
         """
@@ -75,7 +145,29 @@ class ObjectModel:
         """
         if not isinstance(frame, int):
             raise TypeError('Frame number must be an integer')
-        self._points[frame] = (x, y)
+
+        self._validate_cache()
+        index, inserted = self._points.set_point(frame, x, y)
+        self._points_version += 1
+
+        change = 'insert' if inserted else 'update'
+        self._object_controller.points_changed(
+            self, index, change, *self._engine.points_changed(index, change))
+
+    def remove_point(self, frame):
+        """
+        Removes the point at the specified frame, if there is one.
+
+        :param frame: frame number
+        """
+        self._validate_cache()
+        index = self._points.remove_point(frame)
+
+        if index is not None:
+            self._points_version += 1
+            self._object_controller.points_changed(
+                self, index, 'remove',
+                *self._engine.points_changed(index, 'remove'))
 
     def _get_scale_factor(self):
         """
@@ -85,30 +177,45 @@ class ObjectModel:
         pixels, actual, unit = self._object_controller.get_ruler_length()
         return actual / pixels, unit
 
-    def _convert_to_true_position(self, x, y):
+    def _get_transform(self):
         """
-        Converts the given position (px) to the actual position (length unit).
-
-        :param x: x-coordinate of the position
-        :param y: y-coordinate of the position
-        :return: x and y coordinates of the true position
+        Returns the matrix that converts a vector in pixels (e.g. a
+        displacement or velocity) to the actual length unit, by rotating it
+        to the reference axes and scaling it by the ruler.
         """
-        origin_x, origin_y = self._object_controller.get_origin_pos()
-
         scale = self._get_scale_factor()[0]
 
-        ref_angle = radians(self._object_controller.get_reference_angle())
+        ref_angle = np.radians(self._object_controller.get_reference_angle())
+        cos_angle, sin_angle = np.cos(ref_angle), np.sin(ref_angle)
 
-        move_x, move_y = x - origin_x, origin_y - y  # Opposite because in the
-        # overlay widget, positive y is down, but we want positive y to be up
+        # The y component is also flipped because in the overlay widget,
+        # positive y is down, but we want positive y to be up
+        return scale * np.array([[cos_angle, sin_angle],
+                                 [sin_angle, -cos_angle]])
 
-        rot_x = cos(ref_angle) * move_x - sin(ref_angle) * move_y
-        rot_y = sin(ref_angle) * move_x + cos(ref_angle) * move_y
+    def _convert_to_true_vector(self, x, y):
+        """
+        Converts the given vectors (px) to the actual vectors (length unit).
+        The vectors may be scalars or arrays, which are converted all at once.
 
-        true_x = scale * rot_x
-        true_y = scale * rot_y
+        :param x: x-component(s) of the vector
+        :param y: y-component(s) of the vector
+        :return: x and y components of the true vector
+        """
+        (xx, xy), (yx, yy) = self._get_transform()
+        return xx * x + xy * y, yx * x + yy * y
 
-        return true_x, true_y
+    def _convert_to_true_position(self, x, y):
+        """
+        Converts the given positions (px) to the actual positions (length unit).
+        The positions may be scalars or arrays, which are converted all at once.
+
+        :param x: x-coordinate(s) of the position
+        :param y: y-coordinate(s) of the position
+        :return: x and y coordinates of the true position
+        """
+        origin_x, origin_y = self._object_controller.get_origin_pos()
+        return self._convert_to_true_vector(x - origin_x, y - origin_y)
 
     def get_last_n_points(self, n):
         """
@@ -116,133 +223,172 @@ class ObjectModel:
 
         :param n: How many points to return.
         """
-        return dict(sorted(self._points.items())[-n:])
+        return self._points.get_points(max(len(self._points) - n, 0),
+                                       len(self._points))
 
-    def _get_x(self):
+    def get_points_between(self, first, last):
         """
-        Calculates and returns the actual x positions of all of the points.
+        Returns the points with frame numbers between first and last
+        (inclusive).
 
-        :return: A dict of the frames and the actual x positions.
+        :param first: The first frame number.
+        :param last: The last frame number.
+        :return: A dict of frame -> (x, y)
         """
-        x_positions = {}
-        for frame, point in sorted(self._points.items()):
-            x, _ = self._convert_to_true_position(*point)
-            x_positions[frame] = x
-        return x_positions
+        return self._points.get_points(
+            *self._points.get_index_range(first, last))
 
-    def _get_y(self):
+    def get_nearest_point(self, frame):
         """
-        Calculates and returns the actual y positions of all of the points.
+        Returns the tracked point with the frame number closest to the given
+        frame.
 
-        :return: A dict of the frames and the actual y positions.
+        :param frame: The frame number.
+        :return: The frame of the point and its (x, y) position, or None if
+        there are no points.
         """
-        y_positions = {}
-        for frame, point in sorted(self._points.items()):
-            _, y = self._convert_to_true_position(*point)
-            y_positions[frame] = y
-        return y_positions
+        index = self._points.get_nearest_index(frame)
+        if index is None:
+            return None
+        (point_frame, point), = self._points.get_points(index,
+                                                        index + 1).items()
+        return point_frame, point
 
-    def _calculate_derivative(self, points):
+    def _get_px(self, window=slice(None)):
         """
-        Calculates and returns the derivative (or at least approximates it),
-        of the given points.
-
-        The first point will be None, as two points are required to calculate
-        the derivative.
+        Returns the x positions of the points (px), in frame order.
 
-        :param points: The x and y values of the points.
-        :return: The x and y derivatives of the points.
+        :param window: The slice of points to return.
         """
-        d_values = {}
-        prev_time, prev_p = None, None
-
-        for frame, p in points.items():
-            time = self._get_time(frame)
-            if prev_p is None:
-                d_values[frame] = None
-            else:
-                d_values[frame] = (p - prev_p) / (time - prev_time)
+        return self._points.get_x()[window].copy()
 
-            prev_time, prev_p = time, p
-        return d_values
-
-    def _combine_values(self, x_points, y_points):
+    def _get_py(self, window=slice(None)):
         """
-        Combines a series of x values and y values into a magnitude value.
-        This uses Pythagoras's Theorem on each x,y pair.
+        Returns the y positions of the points (px), in frame order.
 
-        :param x_points: The x positions of the points.
-        :param y_points: The y positions of the points.
-        :return: The magnitude of the points.
+        :param window: The slice of points to return.
         """
-        values = {}
+        return self._points.get_y()[window].copy()
 
-        for frame, x in x_points.items():
-            y = y_points[frame]
+    def _get_true_x(self, px, py):
+        """
+        Returns the actual x positions of the given positions (px).
+        """
+        return self._convert_to_true_position(px, py)[0]
 
-            if x is None or y is None:
-                values[frame] = None
-            else:
-                values[frame] = sqrt(x ** 2 + y ** 2)
+    def _get_true_y(self, px, py):
+        """
+        Returns the actual y positions of the given positions (px).
+        """
+        return self._convert_to_true_position(px, py)[1]
 
-        return values
+    def _get_true_x_component(self, x_components, y_components):
+        """
+        Returns the actual x components of the given vectors (px), e.g. the
+        velocities in px/s.
+        """
+        return self._convert_to_true_vector(x_components, y_components)[0]
 
-    def _get_r(self):
+    def _get_true_y_component(self, x_components, y_components):
         """
-        Returns the magnitude of the positions.
+        Returns the actual y components of the given vectors (px).
         """
-        return self._combine_values(self._get_x(), self._get_y())
+        return self._convert_to_true_vector(x_components, y_components)[1]
 
-    def _get_vx(self):
+    def _calculate_derivative(self, values, times):
         """
-        Returns the x component of the velocity.
+        Calculates and returns the derivative (or at least approximates it),
+        of the given values, using the project's derivative scheme.
+
+        Values without enough neighbouring points (e.g. the first value) will
+        be NaN.
+
+        :param values: The values to differentiate, in frame order.
+        :param times: The times of the values.
+        :return: The derivatives of the values.
         """
-        return self._calculate_derivative(self._get_x())
+        return calculate_derivative(
+            values, times, self._object_controller.get_derivative_scheme())
 
-    def _get_vy(self):
+    def _combine_values(self, x_values, y_values):
         """
-        Returns the y component of the velocity.
+        Combines a series of x values and y values into a magnitude value.
+        This uses Pythagoras's Theorem on each x,y pair.
+
+        :param x_values: The x components.
+        :param y_values: The y components.
+        :return: The magnitudes.
         """
-        return self._calculate_derivative(self._get_y())
+        return np.hypot(x_values, y_values)
 
-    def _get_v(self):
+    def _get_t(self, window=slice(None)):
         """
-        Returns the magnitude of the velocity.
+        Returns the times of the points, in frame order.
+
+        :param window: The slice of points to calculate.
         """
-        return self._combine_values(self._get_vx(), self._get_vy())
+        return self._get_times(self._points.get_frames()[window])
+
+    def _get_frame(self, window=slice(None)):
+        return self._points.get_frames()[window].copy()
 
-    def _get_ax(self):
+    def _validate_measurements(self, measurements):
         """
-        Returns the x component of the acceleration.
+        Raises an InvalidMeasurementError if any of the given measurements
+        are not available.
         """
-        return self._calculate_derivative(self._get_vx())
+        for measurement in measurements:
+            if measurement not in self._available_measurements:
+                raise InvalidMeasurementError(f'{measurement} is not a valid '
+                                              f'measurement.')
 
-    def _get_ay(self):
+    def get_measurement_arrays(self, *measurements):
         """
-        Returns the y component of the acceleration.
+        Calculates the given measurements for all of the points, sharing any
+        intermediate measurements between them.
+
+        Values that cannot be calculated (e.g. the first velocity) are NaN.
+        The arrays are cached until the points or calibration change, so they
+        must not be modified.
+
+        :param measurements: The measurements to calculate.
+        :return: An array of the frame numbers, and a dict of the measurement
+        names and arrays of their values (in the same order as the frames).
         """
-        return self._calculate_derivative(self._get_vy())
+        self._validate_measurements(measurements)
+        self._validate_cache()
 
-    def _get_a(self):
+        values = self._engine.evaluate('frame', *measurements)
+        return values['frame'], {measurement: values[measurement]
+                                 for measurement in measurements}
+
+    def _set_derivative_radius(self, scheme):
         """
-        Returns the magnitude of the acceleration.
+        Sets how far changes to the points spread through the derivatives,
+        for the given derivative scheme.
         """
-        return self._combine_values(self._get_ax(), self._get_ay())
+        radius = get_radius(scheme)
+        self._engine.set_radii({key: radius for key in
+                                ('pvx', 'pvy', 'pax', 'pay')})
 
-    def _get_t(self):
+    def _validate_cache(self):
         """
-        Returns all of the times, each assigned to the time.
+        Clears the cached measurements that are affected by any changes to the
+        calibration or derivative scheme since they were calculated. Moving
+        the ruler or axes ('space') keeps the measurements in pixels, so only
+        the transform from them needs to be reapplied. Changes to the points
+        are instead patched into the cache as they happen.
         """
-        times = {}
-        for frame in sorted(self._points.keys()):
-            times[frame] = self._get_time(frame)
-        return times
+        space_version, time_version = \
+            self._object_controller.get_calibration_version()
+        scheme = self._object_controller.get_derivative_scheme()
 
-    def _get_frame(self):
-        frames = {}
-        for frame in sorted(self._points.keys()):
-            frames[frame] = frame
-        return frames
+        self._set_derivative_radius(scheme)
+        self._engine.validate_cache({
+            'space': space_version,
+            'time': time_version,
+            'scheme': scheme,
+        })
 
     def calculate_measurement(self, measurement):
         """
@@ -250,17 +396,17 @@ class ObjectModel:
 
         :param measurement: The measurement to calculate,
         must be one of the available measurements.
+        :return: A dict of the frames and the values of the measurement.
         """
-        if measurement not in self._available_measurements:
-            raise InvalidMeasurementError(f'{measurement} is not a valid '
-                                          f'measurement.')
-        return self._available_measurements[measurement][0]()
+        frames, values = self.get_measurement_arrays(measurement)
+        return dict(zip(frames.tolist(),
+                        _to_optional_list(values[measurement])))
 
     def get_available_measurements(self):
         """
         Returns all of the available measurements, and their units.
         """
-        return {key: value[1]() for key, value in
+        return {key: value[2]() for key, value in
                 self._available_measurements.items()}
 
     def get_data(self, *args):
@@ -270,29 +416,38 @@ class ObjectModel:
         :param args: The measurements to calculate and return.
         :return: A dict of the measurement names and the calculated data.
         """
-        data = {}
+        frames, values = self.get_measurement_arrays(
+            *[arg for arg in args if arg != ''])
+        frames = frames.tolist()
+
+        data = {frame: {} for frame in frames}
 
         for arg in args:
             if arg == '':
-                measurements = {frame: '' for frame in sorted(self._points.keys())}
+                measurements = [''] * len(frames)
             else:
-                measurements = self.calculate_measurement(arg)
-            for frame, measurement in measurements.items():
-                if frame not in data:
-                    data[frame] = {}
+                measurements = _to_optional_list(values[arg])
+            for frame, measurement in zip(frames, measurements):
                 data[frame][arg] = measurement
 
         return data
 
-    def _get_time(self, frame):
-        return self._object_controller.get_time(frame)
+    def _get_times(self, frames):
+        """
+        Returns an array of the times of an array of frame numbers.
+        """
+        return self._object_controller.get_times(frames)
 
     def load(self, data):
-        self._points = {int(k): v for k, v in data['points'].items()}
+        self._points.load(data['points'])
+        self._points_version += 1
+        self._engine.invalidate()
         self._name = data['name']
+        self._id = data.get('id', self._id)
 
     def dump(self):
         return {
-            'points': self._points,
+            'points': self._points.to_dict(),
             'name': self._name,
+            'id': self._id,
         }
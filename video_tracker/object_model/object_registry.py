@@ -0,0 +1,113 @@
+# Exceptions
+class DuplicateObjectNameError(Exception):
+    pass
+
+
+class UnknownObjectError(Exception):
+    pass
+
+
+# Classes
+class ObjectRegistry:
+    # The objects, by name (in the order they were added). Listeners are told
+    # about each object that is added, removed or renamed, so they can update
+    # just that object rather than everything
+    def __init__(self):
+        self._objects = {}  # Name -> ObjectModel
+        self._listeners = []
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __iter__(self):
+        return iter(list(self._objects.values()))
+
+    def __contains__(self, name):
+        return name in self._objects
+
+    def add_listener(self, listener):
+        """
+        Adds a listener, which has object_added(name), object_removed(name)
+        and object_renamed(old_name, new_name) methods.
+        """
+        self._listeners.append(listener)
+
+    def get(self, name):
+        """
+        Returns the object with the given name (or None if there isn't one).
+        """
+        return self._objects.get(name)
+
+    def get_names(self):
+        """
+        Returns a list of the names of the objects, in the order they were
+        added.
+        """
+        return list(self._objects.keys())
+
+    def _check_name_available(self, name):
+        """
+        Raises a DuplicateObjectNameError if there is already an object with
+        the given name.
+        """
+        if name in self._objects:
+            raise DuplicateObjectNameError(f'There is already an object '
+                                           f'called {name}.')
+
+    def _check_exists(self, name):
+        """
+        Raises an UnknownObjectError if there isn't an object with the given
+        name.
+        """
+        if name not in self._objects:
+            raise UnknownObjectError(f'There is no object called {name}.')
+
+    def add(self, object_):
+        """
+        Adds an object, under its name.
+
+        :param object_: The object to add.
+        """
+        name = object_.get_name()
+        self._check_name_available(name)
+
+        self._objects[name] = object_
+
+        for listener in self._listeners:
+            listener.object_added(name)
+
+    def remove(self, name):
+        """
+        Removes the object with the given name.
+
+        :param name: The name of the object.
+        :return: The removed object.
+        """
+        self._check_exists(name)
+
+        object_ = self._objects.pop(name)
+
+        for listener in self._listeners:
+            listener.object_removed(name)
+
+        return object_
+
+    def rename(self, old_name, new_name):
+        """
+        Renames an object, keeping its position in the order.
+
+        :param old_name: The current name of the object.
+        :param new_name: The new name of the object.
+        """
+        if old_name == new_name:
+            return
+
+        self._check_exists(old_name)
+        self._check_name_available(new_name)
+
+        self._objects = {new_name if name == old_name else name: object_
+                         for name, object_ in self._objects.items()}
+        self._objects[new_name].set_name(new_name)
+
+        for listener in self._listeners:
+            listener.object_renamed(old_name, new_name)
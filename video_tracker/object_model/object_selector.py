@@ -1,7 +1,19 @@
 # Imports
-from PyQt5.QtWidgets import QToolBar, QComboBox, QAction, QLineEdit
+from PyQt5.QtWidgets import QToolBar, QComboBox, QAction, QLineEdit, \
+    QSpinBox, QLabel, QInputDialog, QMessageBox
 from PyQt5.QtGui import QDoubleValidator
 
+try:
+    from object_model.derivatives import SCHEME_NAMES
+    from object_model.object_registry import DuplicateObjectNameError
+except ImportError:
+    from derivatives import SCHEME_NAMES
+    from object_registry import DuplicateObjectNameError
+
+
+# Constants
+MAX_TRAIL_FRAMES = 10000
+
 
 # Classes
 class ObjectSelector(QToolBar):
@@ -26,9 +38,18 @@ class ObjectSelector(QToolBar):
 
         self._object_list = QComboBox()
         self._object_list.currentTextChanged.connect(self._text_changed)
-        self._update_object_names()
         self.addWidget(self._object_list)
 
+        self._rename_object_action = QAction('Rename Object')
+        self._rename_object_action.triggered.connect(self._rename_object)
+        self.addAction(self._rename_object_action)
+
+        self._remove_object_action = QAction('Remove Object')
+        self._remove_object_action.triggered.connect(self._remove_object)
+        self.addAction(self._remove_object_action)
+
+        self._update_object_names()
+
         self.addSeparator()
 
         self._ruler_action = QAction('Calibration Ruler')
@@ -67,6 +88,38 @@ class ObjectSelector(QToolBar):
         self._inc_action.setChecked(True)
         self.addAction(self._inc_action)
 
+        self.addSeparator()
+
+        self._scheme_list = QComboBox()
+        self._scheme_list.setToolTip('How velocities and accelerations are '
+                                     'calculated')
+        for scheme, name in SCHEME_NAMES.items():
+            self._scheme_list.addItem(name, scheme)
+        self._update_derivative_scheme()
+        self._scheme_list.currentIndexChanged.connect(
+            self._scheme_changed)
+        self.addWidget(self._scheme_list)
+
+        self.addSeparator()
+
+        self.addWidget(QLabel('Trail'))
+
+        self._trail_before = QSpinBox()
+        self._trail_before.setToolTip('The number of frames before the current '
+                                      'frame to show points for')
+        self._trail_before.setMaximum(MAX_TRAIL_FRAMES)
+        self.addWidget(self._trail_before)
+
+        self._trail_after = QSpinBox()
+        self._trail_after.setToolTip('The number of frames after the current '
+                                     'frame to show points for')
+        self._trail_after.setMaximum(MAX_TRAIL_FRAMES)
+        self.addWidget(self._trail_after)
+
+        self._update_trail_window()
+        self._trail_before.valueChanged.connect(self._trail_changed)
+        self._trail_after.valueChanged.connect(self._trail_changed)
+
     def _set_reference_angle(self):
         """
         Sets the reference angle to the one in the textbox.
@@ -87,35 +140,152 @@ class ObjectSelector(QToolBar):
         """
         Creates a new object in the object controller.
         """
-        self._object_controller.create_object()
+        try:
+            self._object_controller.create_object()
+        except DuplicateObjectNameError as error:
+            QMessageBox.warning(self, 'New Object', str(error))
+
+    def _rename_object(self, triggered):
+        """
+        Asks the user for a new name for the current object, and renames it.
+        """
+        current_object = self._object_controller.get_current_object()
+        if current_object is None:
+            return
+
+        old_name = current_object.get_name()
+        new_name, accepted = QInputDialog.getText(
+            self, 'Rename Object', 'Name:', text=old_name)
+        new_name = new_name.strip()
+
+        if not accepted or new_name == '':
+            return
+
+        try:
+            self._object_controller.rename_object(old_name, new_name)
+        except DuplicateObjectNameError as error:
+            QMessageBox.warning(self, 'Rename Object', str(error))
+
+    def _remove_object(self, triggered):
+        """
+        Removes the current object from the object controller, after asking
+        the user to confirm.
+        """
+        current_object = self._object_controller.get_current_object()
+        if current_object is None:
+            return
+
+        name = current_object.get_name()
+        answer = QMessageBox.question(
+            self, 'Remove Object',
+            f'Remove {name} and all of its points?')
+
+        if answer == QMessageBox.Yes:
+            self._object_controller.remove_object(name)
+
+    def _update_object_actions(self):
+        """
+        Only allows objects to be removed if there would be one left to
+        track.
+        """
+        self._remove_object_action.setEnabled(self._object_list.count() > 1)
 
     def _update_object_names(self):
         """
-        Updates all of the available objects in the combobox to match the ones
-        in the object controller.
+        Fills the combobox with all of the objects in the object controller.
         """
         self._ignore_change = True
-        current_object = self._object_list.currentText()
         self._object_list.clear()
-        object_names = self._object_controller.get_object_names()
-        self._object_list.addItems(object_names)
+        self._object_list.addItems(self._object_controller.get_object_names())
+        self._ignore_change = False
 
-        try:
-            self._object_list.setCurrentIndex(object_names.index(current_object))
-        except ValueError:
-            pass  # The object no longer exists (it was deleted)
+        self._update_object_actions()
+        self._update_current_object()
+
+    def _update_current_object(self):
+        """
+        Selects the object controller's current object in the combobox.
+        """
+        current_object = self._object_controller.get_current_object()
+        if current_object is None:
+            return
+
+        self._ignore_change = True
+        self._object_list.setCurrentIndex(
+            self._object_list.findText(current_object.get_name()))
+        self._ignore_change = False
+
+    def object_added(self, name):
+        """
+        Adds a new object to the combobox.
+        """
+        self._ignore_change = True
+        self._object_list.addItem(name)
+        self._ignore_change = False
+
+        self._update_object_actions()
+
+    def object_removed(self, name):
+        """
+        Removes an object from the combobox.
+        """
+        self._ignore_change = True
+        self._object_list.removeItem(self._object_list.findText(name))
+        self._ignore_change = False
+
+        self._update_object_actions()
+
+    def object_renamed(self, old_name, new_name):
+        """
+        Renames an object in the combobox.
+        """
+        self._ignore_change = True
+        self._object_list.setItemText(self._object_list.findText(old_name),
+                                      new_name)
+        self._ignore_change = False
+
+    def _update_derivative_scheme(self):
+        """
+        Updates the derivative scheme combobox to match the object controller.
+        """
+        self._scheme_list.setCurrentIndex(self._scheme_list.findData(
+            self._object_controller.get_derivative_scheme()))
+
+    def _scheme_changed(self, index):
+        """
+        Sets the derivative scheme to the one selected.
 
+        :param index: The index of the selected scheme.
+        """
+        scheme = self._scheme_list.itemData(index)
+        if scheme != self._object_controller.get_derivative_scheme():
+            self._object_controller.set_derivative_scheme(scheme)
+
+    def _update_trail_window(self):
+        """
+        Updates the trail spinboxes to match the object controller.
+        """
+        before, after = self._object_controller.get_trail_window()
+        self._ignore_change = True
+        self._trail_before.setValue(before)
+        self._trail_after.setValue(after)
         self._ignore_change = False
 
-        if self._object_controller.get_current_object() is None and \
-                len(object_names) > 0:
-            self._object_controller.set_current_object(object_names[0], False)
+    def _trail_changed(self, value):
+        """
+        Sets the trail window to the values in the spinboxes.
+        """
+        if not self._ignore_change:
+            self._object_controller.set_trail_window(
+                self._trail_before.value(), self._trail_after.value())
 
     def update(self):
         """
         Updates the toolbar.
         """
-        self._update_object_names()
+        self._update_current_object()
+        self._update_derivative_scheme()
+        self._update_trail_window()
         # TODO: Update reference angle and visibility
 
     def _text_changed(self, new_text):
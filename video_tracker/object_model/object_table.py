@@ -1,24 +1,40 @@
 # Imports
-from PyQt5.QtWidgets import QMenu, QHeaderView, QAction
+try:
+    from object_model.object_table_model import ObjectTableModel
+except ImportError:
+    from object_table_model import ObjectTableModel
+
+from PyQt5.QtWidgets import QMenu, QHeaderView, QAction, QTableView, \
+    QApplication, QFileDialog
+from PyQt5.QtGui import QKeySequence
 from PyQt5.QtCore import QPoint, Qt
-from pyqtgraph import TableWidget
+
+import csv
+import numpy as np
 
 # Constants
 REMOVE_ACTION = 'Remove column'
 INSERT_RIGHT_ACTION = 'Insert new column to right'
 CHANGE_ACTION = 'Change type'
+COPY_SELECTION_ACTION = 'Copy Selection'
+COPY_ALL_ACTION = 'Copy All'
+SAVE_SELECTION_ACTION = 'Save Selection'
+SAVE_ALL_ACTION = 'Save All'
 
 
 # Classes
-class ObjectTable(TableWidget):
+class ObjectTable(QTableView):
     def __init__(self, object_display):
-        super().__init__(sortable=False)
+        super().__init__()
 
         self._object_display = object_display
 
         # Start with just time
         self._columns = ['t', 'x', 'y']
 
+        self._model = ObjectTableModel()
+        self.setModel(self._model)
+
         self.horizontalHeader().setSectionsMovable(True)
         self.horizontalHeader().setContextMenuPolicy(Qt.CustomContextMenu)
         self.horizontalHeader().customContextMenuRequested.connect(
@@ -26,51 +42,119 @@ class ObjectTable(TableWidget):
         self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.verticalHeader().hide()
 
+        self._context_menu = QMenu()
+        self._context_menu.addAction(COPY_SELECTION_ACTION).triggered.connect(
+            lambda: self.copy(True))
+        self._context_menu.addAction(COPY_ALL_ACTION).triggered.connect(
+            lambda: self.copy(False))
+        self._context_menu.addAction(SAVE_SELECTION_ACTION).triggered.connect(
+            lambda: self.save(True))
+        self._context_menu.addAction(SAVE_ALL_ACTION).triggered.connect(
+            lambda: self.save(False))
+
         self.update()
 
     def update(self):
         """
         Update the column names, and retabulate the data.
         """
-        self.setColumnCount(len(self._columns))
-
-        self._tabulate_data()
-
         available_measurements = self._object_display. \
             get_current_object_available_measurements()
 
-        if available_measurements == {}:
-            return
-
         display_cols = []
         for x in self._columns:
-            if x == '':
-                display_cols.append('')
-            else:
-                display_cols.append(x)
-                if available_measurements[x] is not None:
-                    display_cols[-1] += ' (' + available_measurements[x] + ')'
+            display_cols.append(x)
+            if x != '' and available_measurements.get(x) is not None:
+                display_cols[-1] += ' (' + available_measurements[x] + ')'
 
-        self.setHorizontalHeaderLabels(display_cols)
+        self._model.set_columns(self._columns, display_cols)
+
+        self._tabulate_data()
 
     def _tabulate_data(self):
         """
-        Get data from the object display, and put it into the table.
+        Get the measurement arrays from the object display, and give them to
+        the table model (which only formats the rows that are shown).
         """
-        data = self._object_display.get_data(*self._columns)
+        measurements = [x for x in self._columns if x != '']
+        data = self._object_display.get_measurement_arrays(*measurements)
 
         if data is None:
-            final_data = None
+            # Keep the columns, but without any rows
+            self._model.set_data(np.zeros(0, dtype=np.int64), {})
+            return
+
+        self._model.set_data(*data)
+
+    def points_changed(self, changes):
+        """
+        Updates only the rows affected by changes to the points.
+
+        :param changes: A list of (index, change, start, stop) for each change
+        (see ObjectController.points_changed)
+        """
+        measurements = [x for x in self._columns if x != '']
+        data = self._object_display.get_measurement_arrays(*measurements)
+
+        if data is None:
+            return
+
+        self._model.apply_changes(changes, *data)
+
+    def get_text(self, use_selection=False):
+        """
+        Returns the header labels and values of the table (or just the
+        selected cells) as text, in the order the columns are shown.
+
+        :param use_selection: Whether to only include the selected cells.
+        :return: A list of lists of text, starting with the header labels.
+        """
+        header = self.horizontalHeader()
+
+        if use_selection:
+            indexes = self.selectedIndexes()
+            rows = sorted({index.row() for index in indexes})
+            columns = {index.column() for index in indexes}
         else:
-            final_data = {}
+            rows = range(self._model.rowCount())
+            columns = range(self._model.columnCount())
 
-            for time, data_line in data.items():
-                final_data[time] = [
-                    data_line[col] if data_line[col] is not None
-                    else '' for col in self._columns]
-            final_data = [x[1] for x in sorted(final_data.items())]
+        columns = sorted(columns, key=header.visualIndex)
 
-        self.setData(final_data)
+        return self._model.get_rows_text(rows, columns)
+
+    def copy(self, use_selection=True):
+        """
+        Copies the table (or just the selected cells) to the clipboard, as
+        tab-separated values.
+        """
+        text = ''.join('\t'.join(line) + '\n'
+                       for line in self.get_text(use_selection))
+        QApplication.clipboard().setText(text)
+
+    def save(self, use_selection=False):
+        """
+        Asks the user for a file, and saves the table (or just the selected
+        cells) to it as CSV.
+        """
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, caption='Save Table', filter='CSV Files (*.csv)')
+
+        if file_name is None or file_name == '':
+            return
+
+        with open(file_name, 'w', newline='') as file:
+            csv.writer(file).writerows(self.get_text(use_selection))
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Copy):
+            event.accept()
+            self.copy(True)
+        else:
+            super().keyPressEvent(event)
+
+    def contextMenuEvent(self, event):
+        self._context_menu.popup(event.globalPos())
 
     def _header_section_clicked(self, pos):
         """
@@ -136,11 +220,10 @@ class ObjectTable(TableWidget):
             else:  # Same
                 self._columns[index] = action_to_measurement_type[action][0]
 
-        self.update()
+        self._object_display.columns_changed()
 
     def load(self, data):
         self._columns = data['columns']
-        self.update()
 
     def dump(self):
         return {
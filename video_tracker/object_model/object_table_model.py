@@ -0,0 +1,201 @@
+# Imports
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+import numpy as np
+
+# Constants
+FLOAT_FORMAT = '%0.3g'
+
+
+# Classes
+class ObjectTableModel(QAbstractTableModel):
+    # Presents the measurement arrays of an object as a table, formatting
+    # each value only when it is displayed
+    def __init__(self):
+        super().__init__()
+
+        self._columns = []
+        self._headers = []
+
+        self._frames = np.zeros(0, dtype=np.int64)
+        self._values = {}
+
+        # Kept separately from the frames, as rows are inserted and removed
+        # one at a time before the new arrays are set
+        self._row_count = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid() or \
+                index.row() >= len(self._frames):
+            return None
+
+        measurement = self._columns[index.column()]
+        if measurement == '':
+            return ''
+
+        value = self._values[measurement][index.row()]
+
+        if np.issubdtype(type(value), np.integer):
+            return str(value)
+        if value != value:  # Missing values (NaN) are left blank
+            return ''
+        return FLOAT_FORMAT % value
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+
+        if orientation == Qt.Horizontal:
+            if section < len(self._headers):
+                return self._headers[section]
+            return None
+
+        return str(section + 1)
+
+    def set_columns(self, columns, headers):
+        """
+        Sets the measurements shown in each column, and their header labels.
+
+        :param columns: A list of the measurement names ('' for a blank
+        column).
+        :param headers: A list of the header labels of the columns.
+        """
+        if columns != self._columns:
+            self.beginResetModel()
+            self._columns = list(columns)
+            self._headers = list(headers)
+            self._values = {}
+            self._frames = np.zeros(0, dtype=np.int64)
+            self._row_count = 0
+            self.endResetModel()
+        elif headers != self._headers:
+            self._headers = list(headers)
+            self.headerDataChanged.emit(Qt.Horizontal, 0,
+                                        len(self._headers) - 1)
+
+    def set_data(self, frames, values):
+        """
+        Sets the values shown in the table. The arrays are kept rather than
+        copied, so they must not be modified afterwards.
+
+        :param frames: An array of the frame numbers, one for each row.
+        :param values: A dict of measurement name -> array of values (in the
+        same order as the frames), for each non-blank column.
+        """
+        old_rows = self._row_count
+        new_rows = len(frames)
+
+        if new_rows > old_rows:
+            self.beginInsertRows(QModelIndex(), old_rows, new_rows - 1)
+        elif new_rows < old_rows:
+            self.beginRemoveRows(QModelIndex(), new_rows, old_rows - 1)
+
+        self._frames = frames
+        self._values = values
+        self._row_count = new_rows
+
+        if new_rows > old_rows:
+            self.endInsertRows()
+        elif new_rows < old_rows:
+            self.endRemoveRows()
+
+        self.rows_changed(0, min(old_rows, new_rows))
+
+    def apply_changes(self, changes, frames, values):
+        """
+        Updates the table after changes to individual points, inserting or
+        removing their rows and signalling the rows whose values changed.
+
+        :param changes: A list of (index, change, start, stop) for each
+        change, in order, where change is one of 'insert', 'update' or
+        'remove', and start and stop are the rows whose values changed.
+        :param frames: An array of the frame numbers after the changes.
+        :param values: A dict of measurement name -> array of values after
+        the changes (see set_data).
+        """
+        changed_start, changed_stop = len(frames), 0
+
+        for index, change, start, stop in changes:
+            if change == 'insert':
+                self.beginInsertRows(QModelIndex(), index, index)
+                self._row_count += 1
+                self.endInsertRows()
+            elif change == 'remove':
+                self.beginRemoveRows(QModelIndex(), index, index)
+                self._row_count -= 1
+                self.endRemoveRows()
+
+            # Rows after an insertion or removal have moved
+            if change != 'update' and changed_stop > index:
+                changed_stop += 1 if change == 'insert' else -1
+
+            changed_start = min(changed_start, start)
+            changed_stop = max(changed_stop, stop)
+
+        if self._row_count != len(frames):  # The changes didn't match
+            self.beginResetModel()
+            self._frames = frames
+            self._values = values
+            self._row_count = len(frames)
+            self.endResetModel()
+            return
+
+        self._frames = frames
+        self._values = values
+
+        self.rows_changed(changed_start, min(changed_stop, len(frames)))
+
+    def get_rows_text(self, rows, columns):
+        """
+        Returns the header labels and values of some of the cells as text,
+        with the values at full precision (e.g. for copying or saving them).
+
+        :param rows: A list of the rows to include.
+        :param columns: A list of the columns to include, in order.
+        :return: A list of lists of text, starting with the header labels.
+        """
+        text = [[self._headers[column] if column < len(self._headers)
+                 else '' for column in columns]]
+
+        for row in rows:
+            if row >= len(self._frames):
+                continue
+
+            line = []
+            for column in columns:
+                measurement = self._columns[column]
+                if measurement == '':
+                    line.append('')
+                    continue
+
+                value = self._values[measurement][row]
+                if np.issubdtype(type(value), np.integer):
+                    line.append(str(value))
+                elif value != value:  # Missing values (NaN) are left blank
+                    line.append('')
+                else:
+                    line.append(repr(float(value)))
+            text.append(line)
+
+        return text
+
+    def rows_changed(self, start, stop):
+        """
+        Signals that the values in some of the rows have changed.
+
+        :param start: The first row that changed.
+        :param stop: The row after the last one that changed.
+        """
+        if stop > start and len(self._columns) > 0:
+            self.dataChanged.emit(self.index(start, 0),
+                                  self.index(stop - 1, len(self._columns) - 1))
@@ -0,0 +1,187 @@
+# Imports
+import numpy as np
+
+
+# Constants
+INITIAL_CAPACITY = 16
+
+
+# Classes
+class PointStore:
+    # Model
+    def __init__(self, points=None):
+        self._frames = np.empty(INITIAL_CAPACITY, dtype=np.int64)
+        self._x = np.empty(INITIAL_CAPACITY, dtype=np.float64)
+        self._y = np.empty(INITIAL_CAPACITY, dtype=np.float64)
+        self._size = 0
+
+        if points is not None:
+            self.load(points)
+
+    def __len__(self):
+        return self._size
+
+    def _ensure_capacity(self, capacity):
+        """
+        Grows the underlying arrays (geometrically) so that they can hold at
+        least the given number of points.
+
+        :param capacity: The number of points that must fit.
+        """
+        if capacity <= len(self._frames):
+            return
+
+        new_capacity = max(capacity, 2 * len(self._frames))
+
+        for name in ('_frames', '_x', '_y'):
+            old = getattr(self, name)
+            new = np.empty(new_capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def index_of(self, frame):
+        """
+        Returns the index of the given frame, or None if it is not tracked.
+
+        :param frame: The frame number to look for.
+        """
+        index = int(np.searchsorted(self.get_frames(), frame))
+        if index < self._size and self._frames[index] == frame:
+            return index
+        return None
+
+    def set_point(self, frame, x, y):
+        """
+        Sets the point at the given frame, inserting it so that the frames
+        stay sorted.
+
+        :param frame: The frame number.
+        :param x: x-coordinate of the point (px)
+        :param y: y-coordinate of the point (px)
+        :return: The index of the point, and whether it was newly inserted.
+        """
+        index = int(np.searchsorted(self.get_frames(), frame))
+
+        if index < self._size and self._frames[index] == frame:
+            self._x[index] = x
+            self._y[index] = y
+            return index, False
+
+        self._ensure_capacity(self._size + 1)
+
+        for array in (self._frames, self._x, self._y):
+            array[index + 1:self._size + 1] = array[index:self._size]
+
+        self._frames[index] = frame
+        self._x[index] = x
+        self._y[index] = y
+        self._size += 1
+
+        return index, True
+
+    def remove_point(self, frame):
+        """
+        Removes the point at the given frame.
+
+        :param frame: The frame number.
+        :return: The index the point was at, or None if it was not tracked.
+        """
+        index = self.index_of(frame)
+        if index is None:
+            return None
+
+        for array in (self._frames, self._x, self._y):
+            array[index:self._size - 1] = array[index + 1:self._size]
+
+        self._size -= 1
+
+        return index
+
+    def get_frames(self):
+        """
+        Returns the (sorted) frame numbers of the points.
+        """
+        return self._frames[:self._size]
+
+    def get_x(self):
+        """
+        Returns the x-coordinates of the points (px), in frame order.
+        """
+        return self._x[:self._size]
+
+    def get_y(self):
+        """
+        Returns the y-coordinates of the points (px), in frame order.
+        """
+        return self._y[:self._size]
+
+    def get_index_range(self, first, last):
+        """
+        Returns the range of indices of the points with frames between first
+        and last (inclusive).
+
+        :param first: The first frame number.
+        :param last: The last frame number.
+        :return: The start and stop indices (stop is exclusive).
+        """
+        frames = self.get_frames()
+        return (int(np.searchsorted(frames, first, 'left')),
+                int(np.searchsorted(frames, last, 'right')))
+
+    def get_nearest_index(self, frame):
+        """
+        Returns the index of the point whose frame is closest to the given
+        frame (the earlier one if there is a tie), or None if there are no
+        points.
+
+        :param frame: The frame number.
+        """
+        if self._size == 0:
+            return None
+
+        index = int(np.searchsorted(self.get_frames(), frame))
+
+        if index == self._size:
+            return index - 1
+        if index > 0 and \
+                frame - self._frames[index - 1] <= self._frames[index] - frame:
+            return index - 1
+        return index
+
+    def get_points(self, start, stop):
+        """
+        Returns the points with indices from start to stop (exclusive).
+
+        :return: A dict of frame -> (x, y)
+        """
+        return {frame: (x, y) for frame, x, y in
+                zip(self._frames[start:stop].tolist(),
+                    self._x[start:stop].tolist(),
+                    self._y[start:stop].tolist())}
+
+    def to_dict(self):
+        """
+        Returns the points as a dict of frame -> (x, y).
+        """
+        return self.get_points(0, self._size)
+
+    def load(self, points):
+        """
+        Replaces the stored points with the given ones.
+
+        :param points: A dict of frame -> (x, y)
+        """
+        frames = np.fromiter((int(frame) for frame in points.keys()),
+                             dtype=np.int64, count=len(points))
+        coordinates = np.array(list(points.values()),
+                               dtype=np.float64).reshape(-1, 2)
+
+        order = np.argsort(frames, kind='stable')
+
+        self._size = 0
+        self._ensure_capacity(len(frames))
+        self._size = len(frames)
+
+        self._frames[:self._size] = frames[order]
+        self._x[:self._size] = coordinates[order, 0]
+        self._y[:self._size] = coordinates[order, 1]
@@ -0,0 +1,104 @@
+# Imports
+from PyQt5.QtCore import QTimer
+
+import time
+
+# Constants
+FRAME_BUDGET = 1 / 30  # Minimum time between throttled updates (s)
+
+POINTS = 'points'  # Points were added, moved or removed
+CALIBRATION = 'calibration'  # The conversion to measurements changed
+COLUMNS = 'columns'  # The measurements being displayed changed
+OBJECTS = 'objects'  # Objects were added or the current object changed
+POSITION = 'position'  # The current frame of the video changed
+
+
+# Functions
+def _schedule_next_turn(callback, delay=0):
+    """
+    Calls the callback once control returns to the event loop, after at
+    least the given delay (s).
+    """
+    QTimer.singleShot(int(delay * 1000), callback)
+
+
+# Classes
+class UpdateScheduler:
+    # Collects what has changed, so that the views are only updated once per
+    # turn of the event loop, however many changes there were
+    def __init__(self, flush, schedule=_schedule_next_turn,
+                 clock=time.monotonic, frame_budget=FRAME_BUDGET):
+        """
+        :param flush: Called with the set of flags that were invalidated
+        since the last flush.
+        :param schedule: Called with a callback and a delay (s), to run the
+        callback once the current changes are complete (by default, on the
+        next turn of the event loop).
+        :param clock: Returns the current time (s).
+        :param frame_budget: The minimum time between throttled flushes (s).
+        """
+        self._flush = flush
+        self._schedule = schedule
+        self._clock = clock
+        self._frame_budget = frame_budget
+
+        self._dirty = set()
+
+        # When the pending flush will run (None if there isn't one), and
+        # which scheduled callback will run it
+        self._scheduled_time = None
+        self._schedule_id = 0
+
+        self._last_flush_time = None
+
+    def invalidate(self, *flags, throttle=False):
+        """
+        Marks the given flags as dirty, and schedules a flush if one isn't
+        already pending.
+
+        :param flags: The flags to invalidate (e.g. POINTS, CALIBRATION)
+        :param throttle: Whether the flush can wait until a frame budget has
+        passed since the last one (e.g. for a live preview while dragging).
+        """
+        self._dirty.update(flags)
+
+        now = self._clock()
+        delay = 0
+        if throttle and self._last_flush_time is not None:
+            delay = max(self._last_flush_time + self._frame_budget - now, 0)
+
+        if self._scheduled_time is None or now + delay < self._scheduled_time:
+            self._scheduled_time = now + delay
+            self._schedule_id += 1
+            self._schedule(
+                lambda schedule_id=self._schedule_id: self._run(schedule_id),
+                delay)
+
+    def is_pending(self):
+        """
+        Returns whether there are changes that haven't been flushed yet.
+        """
+        return len(self._dirty) > 0
+
+    def flush(self):
+        """
+        Flushes any pending changes immediately.
+        """
+        if self.is_pending():
+            flags = self._dirty
+            self._dirty = set()
+            self._last_flush_time = self._clock()
+            self._flush(flags)
+
+    def _run(self, schedule_id):
+        """
+        Runs a scheduled flush, unless it has been superseded by an earlier
+        one.
+
+        :param schedule_id: Which scheduled callback is running.
+        """
+        if schedule_id != self._schedule_id:
+            return
+
+        self._scheduled_time = None
+        self.flush()
@@ -0,0 +1,120 @@
+# Imports
+from collections import OrderedDict
+
+# Constants
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024  # bytes
+
+
+# Classes
+class FrameCache:
+    # Decoded frames (QImages), by frame number. The least recently used
+    # frames are removed to keep the total size of the frames within the
+    # memory budget
+    def __init__(self, memory_budget=DEFAULT_MEMORY_BUDGET):
+        """
+        :param memory_budget: The most memory (bytes) the frames can use.
+        """
+        self._frames = OrderedDict()  # Frame number -> QImage
+        self._memory_used = 0
+        self._memory_budget = memory_budget
+
+        self._hit_count = 0
+        self._miss_count = 0
+
+    def __len__(self):
+        return len(self._frames)
+
+    def __contains__(self, frame_number):
+        return frame_number in self._frames
+
+    def get(self, frame_number):
+        """
+        Returns the frame with the given number, or None if it isn't cached.
+        Counts as a hit or a miss.
+
+        :param frame_number: The number of the frame.
+        """
+        image = self._frames.get(frame_number)
+
+        if image is None:
+            self._miss_count += 1
+            return None
+
+        self._hit_count += 1
+        self._frames.move_to_end(frame_number)
+        return image
+
+    def put(self, frame_number, image):
+        """
+        Caches a frame, removing the least recently used frames if there isn't
+        enough memory for it. Frames bigger than the whole budget aren't
+        cached.
+
+        :param frame_number: The number of the frame.
+        :param image: The frame (QImage), which mustn't share its data with
+        a buffer that will be reused (e.g. a mapped video frame).
+        """
+        self.remove(frame_number)
+
+        size = image.sizeInBytes()
+        if size > self._memory_budget:
+            return
+
+        self._frames[frame_number] = image
+        self._memory_used += size
+
+        self._evict()
+
+    def remove(self, frame_number):
+        """
+        Removes a frame from the cache, if it is cached.
+        """
+        image = self._frames.pop(frame_number, None)
+        if image is not None:
+            self._memory_used -= image.sizeInBytes()
+
+    def _evict(self):
+        """
+        Removes the least recently used frames until the frames are within
+        the memory budget.
+        """
+        while self._memory_used > self._memory_budget:
+            _, image = self._frames.popitem(last=False)
+            self._memory_used -= image.sizeInBytes()
+
+    def clear(self):
+        """
+        Removes all of the frames (e.g. when another video is opened). The hit
+        and miss counts are kept.
+        """
+        self._frames.clear()
+        self._memory_used = 0
+
+    def set_memory_budget(self, memory_budget):
+        """
+        Sets the most memory (bytes) the frames can use, removing frames if
+        they no longer fit.
+        """
+        self._memory_budget = memory_budget
+        self._evict()
+
+    def get_memory_budget(self):
+        return self._memory_budget
+
+    def get_memory_used(self):
+        """
+        Returns the total size (bytes) of the cached frames.
+        """
+        return self._memory_used
+
+    def get_hit_count(self):
+        """
+        Returns how many times a frame was found in the cache.
+        """
+        return self._hit_count
+
+    def get_miss_count(self):
+        """
+        Returns how many times a frame wasn't found in the cache.
+        """
+        return self._miss_count
@@ -0,0 +1,219 @@
+# Imports
+from PyQt5.QtCore import QTimer, QUrl
+from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, \
+    QAbstractVideoSurface, QAbstractVideoBuffer, QVideoFrame
+
+# Constants
+DEFAULT_DEPTH = 8  # frames
+DEFAULT_MEMORY_CAP = 64 * 1024 * 1024  # bytes
+# How long to wait (ms) for a frame to be decoded before giving up on it
+FRAME_TIMEOUT = 1000
+
+
+# Classes
+class FrameCaptureSurface(QAbstractVideoSurface):
+    # A video output that passes each frame to a function, rather than
+    # displaying it. Only RGB formats are offered, so that the frames can be
+    # copied straight into images
+    def __init__(self, frame_presented):
+        super().__init__()
+        self._frame_presented = frame_presented
+
+    def supportedPixelFormats(self, handle_type=QAbstractVideoBuffer.NoHandle):
+        if handle_type != QAbstractVideoBuffer.NoHandle:
+            return []
+        return [QVideoFrame.Format_RGB32, QVideoFrame.Format_ARGB32,
+                QVideoFrame.Format_ARGB32_Premultiplied]
+
+    def present(self, frame):
+        self._frame_presented(frame)
+        return True
+
+
+class FramePrefetcher:
+    # Decodes the frames that are likely to be stepped to next into the frame
+    # cache, using a second (hidden) media player, whose backend decodes
+    # while the user is busy with the current frame
+    def __init__(self, frame_cache, copy_frame, depth=DEFAULT_DEPTH,
+                 memory_cap=DEFAULT_MEMORY_CAP):
+        """
+        :param frame_cache: The FrameCache to decode the frames into.
+        :param copy_frame: A function that copies a QVideoFrame into a
+        QImage (or returns None if it can't).
+        :param depth: How many frames ahead to decode.
+        :param memory_cap: The most memory (bytes) the frames decoded ahead
+        can use.
+        """
+        self._frame_cache = frame_cache
+        self._copy_frame = copy_frame
+        self._depth = depth
+        self._memory_cap = memory_cap
+
+        self._media_player = QMediaPlayer(None, QMediaPlayer.VideoSurface)
+        self._media_player.setMuted(True)
+        self._surface = FrameCaptureSurface(self._frame_presented)
+        self._media_player.setVideoOutput(self._surface)
+
+        self._timeout_timer = QTimer()
+        self._timeout_timer.setSingleShot(True)
+        self._timeout_timer.setInterval(FRAME_TIMEOUT)
+        self._timeout_timer.timeout.connect(self._frame_timed_out)
+
+        self._frame_rate = None
+        self._frame_count = 0
+        self._frame_size = None  # bytes
+
+        self._last_frame = None
+        self._direction = 1
+
+        self._queue = []  # The numbers of the frames to decode, in order
+        self._pending = None  # The number of the frame being decoded
+
+    def set_video_file(self, video_file, frame_rate, frame_count):
+        """
+        Sets the video to decode the frames of.
+
+        :param video_file: The path to the video file.
+        :param frame_rate: The frame rate of the video.
+        :param frame_count: The number of frames in the video.
+        """
+        self.stop()
+
+        self._frame_rate = frame_rate
+        self._frame_count = frame_count
+        self._frame_size = None
+        self._last_frame = None
+        self._direction = 1
+
+        self._media_player.setMedia(
+            QMediaContent(QUrl.fromLocalFile(video_file)))
+        self._media_player.pause()
+
+    def set_depth(self, depth):
+        """
+        Sets how many frames ahead to decode.
+        """
+        self._depth = depth
+
+    def get_depth(self):
+        return self._depth
+
+    def set_memory_cap(self, memory_cap):
+        """
+        Sets the most memory (bytes) the frames decoded ahead can use.
+        """
+        self._memory_cap = memory_cap
+
+    def get_memory_cap(self):
+        return self._memory_cap
+
+    def _get_depth(self):
+        """
+        Returns how many frames ahead to decode, within the memory cap.
+        """
+        if self._frame_size is None:
+            return self._depth
+        return min(self._depth, self._memory_cap // self._frame_size)
+
+    def plan(self, frame_number, step):
+        """
+        Predicts the frames that will be stepped to next, from the direction
+        of the last step and the step size.
+
+        :param frame_number: The frame that has been stepped to.
+        :param step: The number of frames in each step.
+        :return: A list of the numbers of the frames that aren't cached, in
+        the order they will be stepped to.
+        """
+        if self._last_frame is not None and frame_number != self._last_frame:
+            self._direction = 1 if frame_number > self._last_frame else -1
+        self._last_frame = frame_number
+
+        step = max(int(step), 1)
+
+        frames = []
+        for i in range(1, self._get_depth() + 1):
+            frame = frame_number + i * step * self._direction
+            if frame < 0 or frame >= self._frame_count:
+                break
+            if frame not in self._frame_cache and frame != self._pending:
+                frames.append(frame)
+
+        return frames
+
+    def prefetch(self, frame_number, step):
+        """
+        Starts decoding the frames that will be stepped to next (replacing
+        any frames that were still to be decoded).
+
+        :param frame_number: The frame that has been stepped to.
+        :param step: The number of frames in each step.
+        """
+        if self._frame_rate is None:
+            return
+
+        self._queue = self.plan(frame_number, step)
+        self._prefetch_next()
+
+    def stop(self):
+        """
+        Stops decoding frames (e.g. while the video is playing).
+        """
+        self._queue = []
+        self._pending = None
+        self._timeout_timer.stop()
+
+    def _frame_to_ms(self, frame_number):
+        # Matches VideoController.position_to_ms
+        return int(frame_number / self._frame_rate * 1000)
+
+    def _prefetch_next(self):
+        """
+        Starts decoding the next frame in the queue, if a frame isn't already
+        being decoded.
+        """
+        if self._pending is not None:
+            return
+
+        while len(self._queue) > 0:
+            frame_number = self._queue.pop(0)
+            if frame_number not in self._frame_cache:
+                self._pending = frame_number
+                self._timeout_timer.start()
+                self._media_player.setPosition(
+                    self._frame_to_ms(frame_number))
+                return
+
+    def _frame_presented(self, frame):
+        """
+        Caches a frame that has been decoded, and starts decoding the next
+        one.
+
+        :param frame: The QVideoFrame that was decoded.
+        """
+        if self._pending is None:
+            return
+
+        if frame.startTime() < 0:
+            # Some backends don't timestamp the frames, so assume it is the
+            # frame that was seeked to
+            frame_number = self._pending
+        else:
+            frame_number = round(frame.startTime() / 1e6 * self._frame_rate)
+        image = self._copy_frame(frame)
+
+        if image is not None:
+            self._frame_size = image.sizeInBytes()
+            self._frame_cache.put(frame_number, image)
+
+        if frame_number == self._pending:
+            self._timeout_timer.stop()
+            self._pending = None
+            self._prefetch_next()
+
+    def _frame_timed_out(self):
+        """
+        Gives up on the frame being decoded, and moves on to the next one.
+        """
+        self._pending = None
+        self._prefetch_next()
@@ -0,0 +1,173 @@
+# Imports
+from PyQt5.QtCore import QStandardPaths
+
+import json
+import os
+import threading
+
+# Constants
+CACHE_DIRECTORY_NAME = 'video-tracker'
+CACHE_FILE_NAME = 'media_info.json'
+INFO_KEYS = ('frame_count', 'frame_rate', 'duration')
+
+
+# Functions
+def get_default_cache_file():
+    """
+    Returns the path of the cache file, in this application's directory in
+    the user's cache directory (which doesn't depend on the application name
+    being set).
+    """
+    return os.path.join(
+        QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation),
+        CACHE_DIRECTORY_NAME, CACHE_FILE_NAME)
+
+
+# Classes
+class MediaInfoCache:
+    # The media info (frame count, frame rate and duration) of the videos
+    # that have been opened, saved between sessions so that opening a video
+    # (or a project) doesn't have to parse it again. Each entry is keyed by
+    # the video's absolute path, and is only used if the video's size and
+    # modification time haven't changed
+    def __init__(self, parse, cache_file=None):
+        """
+        :param parse: A function that parses a video file, returning a dict
+        of its frame_count, frame_rate and duration.
+        :param cache_file: The path of the cache file (None for the default,
+        in the user's cache directory).
+        """
+        self._parse = parse
+        self._cache_file = cache_file if cache_file is not None \
+            else get_default_cache_file()
+
+        # The entries are also updated by the refresh thread
+        self._lock = threading.Lock()
+        self._entries = self._read()  # Absolute path -> entry
+        self._refresh_thread = None
+
+    def _read(self):
+        """
+        Returns the entries in the cache file (none if it can't be read).
+        """
+        try:
+            with open(self._cache_file) as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(entries, dict):
+            return {}
+        return entries
+
+    def save(self):
+        """
+        Writes the entries to the cache file. The cache is only there to
+        save time, so failing to write it isn't an error.
+        """
+        with self._lock:
+            entries = dict(self._entries)
+
+        temporary_file = f'{self._cache_file}.{threading.get_ident()}.tmp'
+
+        try:
+            os.makedirs(os.path.dirname(self._cache_file), exist_ok=True)
+            with open(temporary_file, 'w') as file:
+                json.dump(entries, file)
+            # Replace the file in one go, so it is never half-written
+            os.replace(temporary_file, self._cache_file)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _is_fresh(entry, stat):
+        """
+        Returns whether an entry is for the current version of the file.
+        """
+        return entry.get('size') == stat.st_size and \
+            entry.get('mtime') == stat.st_mtime
+
+    def _parse_into_cache(self, path, stat):
+        """
+        Parses a video file, and stores its media info.
+
+        :return: The media info.
+        """
+        info = self._parse(path)
+
+        entry = {key: info[key] for key in INFO_KEYS}
+        entry['size'] = stat.st_size
+        entry['mtime'] = stat.st_mtime
+
+        with self._lock:
+            self._entries[path] = entry
+
+        return info
+
+    def get(self, video_file):
+        """
+        Returns the media info of a video file, only parsing it if it isn't
+        in the cache or its entry is stale (the file has changed since).
+
+        :param video_file: The path to the video file.
+        :return: A dict of the frame_count, frame_rate and duration.
+        """
+        path = os.path.abspath(video_file)
+        stat = os.stat(path)
+
+        with self._lock:
+            entry = self._entries.get(path)
+
+        if entry is not None and self._is_fresh(entry, stat):
+            return {key: entry[key] for key in INFO_KEYS}
+
+        info = self._parse_into_cache(path, stat)
+        self.save()
+        return info
+
+    def refresh_stale_entries(self):
+        """
+        Starts checking all of the entries in the background, re-parsing the
+        videos that have changed and removing the videos that no longer
+        exist, so that opening them later is quick.
+        """
+        if self._refresh_thread is not None and \
+                self._refresh_thread.is_alive():
+            return
+
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_stale_entries, daemon=True)
+        self._refresh_thread.start()
+
+    def _refresh_stale_entries(self):
+        """
+        Re-parses the videos whose entries are stale, and removes those that
+        no longer exist or can't be parsed.
+        """
+        with self._lock:
+            entries = dict(self._entries)
+
+        changed = False
+
+        for path, entry in entries.items():
+            try:
+                stat = os.stat(path)
+                if self._is_fresh(entry, stat):
+                    continue
+                self._parse_into_cache(path, stat)
+            except Exception:
+                with self._lock:
+                    self._entries.pop(path, None)
+
+            changed = True
+
+        if changed:
+            self.save()
+
+    def wait_for_refresh(self):
+        """
+        Waits until the entries have been refreshed in the background (if
+        they are being).
+        """
+        if self._refresh_thread is not None:
+            self._refresh_thread.join()
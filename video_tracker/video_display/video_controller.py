@@ -10,6 +10,8 @@ except ImportError:
     from exceptions import UnknownUnitError, NonPositiveIncrement, \
         NonIntegerIncrement
 
+import numpy as np
+
 
 # Classes
 class VideoController:
@@ -21,6 +23,7 @@ class VideoController:
         self._fps = 1
         self._frame_offset = 0
         self._time_offset = 0.0
+        self._calibration_version = 0
 
         self._object_controller = None
 
@@ -37,6 +40,7 @@ class VideoController:
         # Link the display and the player
         self._video_player.initialise_display(
             self._video_display.get_video_widget())
+        self._video_player.add_frame_listener(self._frame_changed)
 
         self.set_unit(unit)
         self.increment_changed(skip_amount)
@@ -141,6 +145,9 @@ class VideoController:
         self._video_player.set_position(new_position)
         self.ignore_changes = False
 
+        if self._object_controller is not None:
+            self._object_controller.position_changed()
+
     def position_to_ms(self, position, unit=None):
         """
         Converts a position in the specified unit to a number of milliseconds.
@@ -219,7 +226,19 @@ class VideoController:
         if ms_position > self._video_player.get_duration():
             ms_position = self._video_player.get_duration()
 
-        self._video_player.set_position(ms_position)
+        # Decode the frames that the next steps (of the skip amount) will be
+        # to in the background
+        step = max(self.ms_to_position(
+            self.position_to_ms(self._skip_amount), 'frames'), 1)
+        self._video_player.show_position(ms_position, step)
+
+    def _frame_changed(self):
+        """
+        Shows the cached frame that the video player is showing in place of
+        its output (or its output, if there isn't one).
+        """
+        self._video_display.show_frame(
+            self._video_player.get_shown_cached_frame())
 
     def increment_changed(self, new_increment):
         """
@@ -279,24 +298,45 @@ class VideoController:
     def get_time(self, frame):
         return (frame - self._frame_offset)/self._fps + self._time_offset
 
+    def get_times(self, frames):
+        """
+        Returns the times (s) of many frames at once.
+
+        :param frames: An array (or sequence) of frame numbers.
+        :return: An array of the times of the frames.
+        """
+        frames = np.asarray(frames, dtype=np.float64)
+        return (frames - self._frame_offset) / self._fps + self._time_offset
+
     def get_fps(self):
         return self._fps
 
+    def get_calibration_version(self):
+        """
+        Returns a number that changes whenever the frame rate or time offset
+        (and therefore the time of each frame) change.
+        """
+        return self._calibration_version
+
     def set_time(self, frame, time):
         self._frame_offset = frame
         self._time_offset = time
+        self._calibration_version += 1
         if self._object_controller is not None:
-            self._object_controller.update()
+            self._object_controller.calibration_changed()
 
     def set_fps(self, fps):
         self._fps = fps
+        self._calibration_version += 1
         if self._object_controller is not None:
-            self._object_controller.update()
+            self._object_controller.calibration_changed()
 
     def set_object_controller(self, object_controller):
         self._object_controller = object_controller
 
     def load(self, data):
+        if 'video_player' in data:  # Older files don't have its settings
+            self._video_player.load(data['video_player'])
         self.open_video_file(data['video_file'])
         self.set_unit(data['unit'])
         self.set_fps(data['fps'])
@@ -313,4 +353,5 @@ class VideoController:
             'time_offset': self._time_offset,
             'video_file': self._video_player.get_video_file(),
             'current_frame': self.get_current_position('frames'),
+            'video_player': self._video_player.dump(),
         }
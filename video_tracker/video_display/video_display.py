@@ -1,6 +1,7 @@
 # Imports
-from PyQt5.QtWidgets import QWidget, QVBoxLayout
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QGraphicsPixmapItem
 from PyQt5.QtMultimediaWidgets import QGraphicsVideoItem
+from PyQt5.QtGui import QPixmap, QTransform
 from PyQt5.QtCore import Qt, QSize, QRectF
 
 try:
@@ -36,6 +37,12 @@ class VideoDisplay(QWidget):
 
         self._scene.addItem(self._video_widget)
 
+        # A cached frame, shown over the video until the video player has
+        # decoded the frame itself
+        self._cached_frame = QGraphicsPixmapItem()
+        self._cached_frame.setVisible(False)
+        self._scene.addItem(self._cached_frame)
+
         # Create the control bar
         self._control_bar = ControlBar()
 
@@ -101,6 +108,23 @@ class VideoDisplay(QWidget):
         """
         return self._video_widget
 
+    def show_frame(self, image):
+        """
+        Shows a cached frame over the video, scaled to fit it.
+
+        :param image: The frame (QImage), or None to show the video.
+        """
+        if image is None or image.isNull():
+            self._cached_frame.setVisible(False)
+            return
+
+        rect = self._video_widget.boundingRect()
+        self._cached_frame.setPixmap(QPixmap.fromImage(image))
+        self._cached_frame.setPos(self._video_widget.mapToScene(rect.topLeft()))
+        self._cached_frame.setTransform(QTransform.fromScale(
+            rect.width() / image.width(), rect.height() / image.height()))
+        self._cached_frame.setVisible(True)
+
     def register_controller(self, controller):
         """
         Registers a controller to the video display.
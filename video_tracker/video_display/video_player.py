@@ -1,40 +1,125 @@
 # Imports
 from PyQt5.QtCore import QUrl
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, QVideoProbe
+from PyQt5.QtGui import QImage
+from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent, QVideoProbe, \
+    QVideoFrame, QAbstractVideoBuffer
 
 from pymediainfo import MediaInfo
 
 try:
     from video_display.exceptions import TrackCountError
+    from video_display.frame_cache import FrameCache, DEFAULT_MEMORY_BUDGET
+    from video_display.frame_prefetcher import FramePrefetcher
+    from video_display.media_info_cache import MediaInfoCache
 except ImportError:
     from exceptions import TrackCountError
+    from frame_cache import FrameCache, DEFAULT_MEMORY_BUDGET
+    from frame_prefetcher import FramePrefetcher
+    from media_info_cache import MediaInfoCache
+
+
+# Functions
+def parse_media_info(video_file):
+    """
+    Parses a video file, extracting the number of frames, the frame rate and
+    the duration.
+
+    :param video_file: The path to the video file
+    :return: A dict of the frame_count, frame_rate and duration (ms, or None
+    if it isn't known).
+    """
+    media_info = MediaInfo.parse(video_file)
+
+    if len(media_info.video_tracks) != 1:
+        raise TrackCountError('Invalid number of video tracks: %d' %
+                              len(media_info.video_tracks))
+
+    track = media_info.video_tracks[0]
+
+    return {
+        'frame_count': int(track.frame_count),
+        'frame_rate': float(track.frame_rate),
+        'duration': None if track.duration is None
+        else float(track.duration),
+    }
+
+
+def copy_video_frame(frame, rect=None):
+    """
+    Copies (a region of) a video frame into an image.
+
+    :param frame: The QVideoFrame to copy.
+    :param rect: The region (QRect) of the frame to copy, in its native
+    pixels (within the frame), or None for the whole frame.
+    :return: The copy (QImage), or None if the frame is in a format (e.g.
+    YUV) that can't be copied directly or couldn't be mapped.
+    """
+    if frame is None or not frame.isValid():
+        return None
+
+    image_format = QVideoFrame.imageFormatFromPixelFormat(frame.pixelFormat())
+    if image_format == QImage.Format_Invalid:
+        return None
+
+    if not frame.map(QAbstractVideoBuffer.ReadOnly):
+        return None
+
+    try:
+        # Wrap the mapped buffer without copying it, and copy just the
+        # region before it is unmapped
+        image = QImage(frame.bits(), frame.width(), frame.height(),
+                       frame.bytesPerLine(), image_format)
+        if rect is None:
+            return image.copy()
+        return image.copy(rect)
+    finally:
+        frame.unmap()
 
 
 # Classes
 class VideoPlayer:
     # This would be a model
-    def __init__(self):
+    def __init__(self, frame_cache_budget=DEFAULT_MEMORY_BUDGET,
+                 frame_prefetcher=FramePrefetcher,
+                 media_info_cache=MediaInfoCache):
         self._media_player = QMediaPlayer(None, QMediaPlayer.VideoSurface)
 
         self._probe = QVideoProbe(self._media_player)
         self._probe.setSource(self._media_player)
+        self._probe.videoFrameProbed.connect(self._frame_probed)
+
+        # The most recently decoded frame (a reference to its buffer, rather
+        # than a copy), and the functions to call when there is a new one
+        self._latest_frame = None
+        self._frame_listeners = []
+
+        # Copies of the decoded frames, so that stepping to a frame that was
+        # decoded recently can show it straight away, rather than waiting for
+        # the media player to seek to it and decode it again
+        self._frame_cache = FrameCache(frame_cache_budget)
+        # The (frame number, QImage) of the cached frame being shown until the
+        # media player has decoded it, if any
+        self._shown_frame = None
+
+        # Decodes the frames that will be stepped to next into the cache
+        self._frame_prefetcher = frame_prefetcher(self._frame_cache,
+                                                  copy_video_frame)
+
+        # The media info of the videos that have been opened before, so
+        # that they don't have to be parsed again
+        self._media_info_cache = media_info_cache(parse_media_info)
+        self._media_info_cache.refresh_stale_entries()
 
         self._media_info = None
         self._video_file = None
 
     def _process_media_info(self):
         """
-        Processes the _media_info object,
+        Processes the _media_info dict,
         extracting the number of frames and the frame rate.
         """
-        if len(self._media_info.video_tracks) != 1:
-            raise TrackCountError('Invalid number of video tracks: %d' %
-                                  len(self._media_info.tracks))
-
-        track = self._media_info.video_tracks[0]
-
-        self.frame_count = int(track.frame_count)
-        self.frame_rate = float(track.frame_rate)
+        self.frame_count = self._media_info['frame_count']
+        self.frame_rate = self._media_info['frame_rate']
 
     def is_video_imported(self):
         """
@@ -55,9 +140,16 @@ class VideoPlayer:
         self._media_player.setMedia(media_content)
         self._video_file = video_file
 
-        self._media_info = MediaInfo.parse(video_file)
+        self._frame_cache.clear()
+        self._latest_frame = None
+        self._set_shown_frame(None)
+
+        self._media_info = self._media_info_cache.get(video_file)
         self._process_media_info()
 
+        self._frame_prefetcher.set_video_file(video_file, self.frame_rate,
+                                              self.frame_count)
+
     def initialise_display(self, video_widget):
         """
         Sets the output of the video player to be the provided display.
@@ -73,6 +165,8 @@ class VideoPlayer:
         if self._media_player.state() == QMediaPlayer.PlayingState:
             self._media_player.pause()
         else:
+            self._set_shown_frame(None)
+            self._frame_prefetcher.stop()
             self._media_player.play()
 
     def register_controller(self, controller):
@@ -97,8 +191,36 @@ class VideoPlayer:
 
         :param new_position: The new position (ms)
         """
+        if self._shown_frame is not None and \
+                self._shown_frame[0] != self._ms_to_frame(new_position):
+            self._set_shown_frame(None)
+
         self._media_player.setPosition(new_position)
 
+    def show_position(self, new_position, step=None):
+        """
+        Sets the position of the video player to the specified position,
+        showing the frame there straight away if it is cached.
+
+        :param new_position: The new position (ms)
+        :param step: The number of frames in each step, to decode the frames
+        that will be stepped to next in the background (or None to not).
+        """
+        if not self.is_video_imported():
+            self.set_position(new_position)
+            return
+
+        frame_number = self._ms_to_frame(new_position)
+        image = self._frame_cache.get(frame_number)
+        self._set_shown_frame(None if image is None
+                              else (frame_number, image))
+
+        self.set_position(new_position)
+
+        if step is not None and \
+                self._media_player.state() != QMediaPlayer.PlayingState:
+            self._frame_prefetcher.prefetch(frame_number, step)
+
     def get_position(self):
         """
         Gets the current position of the video player.
@@ -123,5 +245,145 @@ class VideoPlayer:
         """
         self._media_player.setNotifyInterval(interval)
 
+    def _ms_to_frame(self, ms):
+        """
+        Returns the number of the frame at the given time (ms).
+        """
+        try:
+            return round(ms * self.frame_rate / 1000.0)
+        except AttributeError:
+            return 0
+
+    def _get_frame_number(self, frame):
+        """
+        Returns the number of a decoded frame, or None if it isn't
+        timestamped (the position may already be that of a later seek, so it
+        can't be used instead).
+        """
+        start_time = frame.startTime()  # us
+        if start_time < 0:
+            return None
+        return self._ms_to_frame(start_time / 1000.0)
+
+    def _frame_probed(self, frame):
+        """
+        Keeps the frame that has just been decoded, and notifies the frame
+        listeners. Frames that were stepped or seeked to are also copied into
+        the cache, but frames decoded during playback aren't, so that
+        playing doesn't copy every frame.
+
+        :param frame: The QVideoFrame that was decoded.
+        """
+        self._latest_frame = QVideoFrame(frame)
+
+        if not self.is_video_imported():
+            self._notify_frame_listeners()
+            return
+
+        frame_number = self._get_frame_number(frame)
+
+        if frame_number is not None and \
+                self._media_player.state() != QMediaPlayer.PlayingState:
+            image = copy_video_frame(frame)
+            if image is not None:
+                self._frame_cache.put(frame_number, image)
+
+        # The media player has caught up with the cached frame (if the frame
+        # isn't timestamped, assume it has)
+        if self._shown_frame is not None and \
+                frame_number in (self._shown_frame[0], None):
+            self._shown_frame = None
+
+        self._notify_frame_listeners()
+
+    def _set_shown_frame(self, shown_frame):
+        """
+        Sets the cached frame to show until the media player has decoded it,
+        notifying the frame listeners if it changes.
+
+        :param shown_frame: The (frame number, QImage) of the frame, or None.
+        """
+        if shown_frame is None and self._shown_frame is None:
+            return
+
+        self._shown_frame = shown_frame
+        self._notify_frame_listeners()
+
+    def _notify_frame_listeners(self):
+        for listener in self._frame_listeners:
+            listener()
+
+    def add_frame_listener(self, listener):
+        """
+        Adds a function to call (with no arguments) whenever the frame being
+        shown changes, i.e. a new frame has been decoded or a cached frame is
+        shown (or hidden).
+        """
+        self._frame_listeners.append(listener)
+
+    def get_shown_cached_frame(self):
+        """
+        Returns the cached frame (QImage) being shown in place of the media
+        player's output, or None if the media player's output is shown.
+        """
+        if self._shown_frame is None:
+            return None
+        return self._shown_frame[1]
+
+    def get_frame_cache(self):
+        """
+        Returns the cache of decoded frames (e.g. for its hit and miss
+        counts).
+        """
+        return self._frame_cache
+
+    def get_frame_prefetcher(self):
+        """
+        Returns the frame prefetcher (e.g. to set its depth or memory cap).
+        """
+        return self._frame_prefetcher
+
+    def get_latest_frame_size(self):
+        """
+        Returns the size (QSize) of the frame being shown, in its native
+        pixels, or None if there isn't one that can be cropped.
+        """
+        if self._shown_frame is not None:
+            return self._shown_frame[1].size()
+
+        frame = self._latest_frame
+        if frame is None or not frame.isValid() or \
+                QVideoFrame.imageFormatFromPixelFormat(frame.pixelFormat()) \
+                == QImage.Format_Invalid:
+            return None
+        return frame.size()
+
+    def crop_latest_frame(self, rect):
+        """
+        Copies a region out of the frame being shown, at its native
+        resolution. Only the region is copied out of the frame's buffer.
+
+        :param rect: The region (QRect) of the frame, in its native pixels
+        (within the frame).
+        :return: The region (QImage), or None if the frame is in a format
+        (e.g. YUV) that can't be cropped directly or couldn't be mapped.
+        """
+        if self._shown_frame is not None:
+            return self._shown_frame[1].copy(rect)
+
+        return copy_video_frame(self._latest_frame, rect)
+
     def get_video_file(self):
         return self._video_file
+
+    def load(self, data):
+        self._frame_cache.set_memory_budget(data['frame_cache_budget'])
+        self._frame_prefetcher.set_depth(data['prefetch_depth'])
+        self._frame_prefetcher.set_memory_cap(data['prefetch_memory_cap'])
+
+    def dump(self):
+        return {
+            'frame_cache_budget': self._frame_cache.get_memory_budget(),
+            'prefetch_depth': self._frame_prefetcher.get_depth(),
+            'prefetch_memory_cap': self._frame_prefetcher.get_memory_cap(),
+        }
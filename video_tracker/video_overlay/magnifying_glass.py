@@ -1,46 +1,144 @@
 # Imports
-from PyQt5.QtWidgets import QGraphicsPixmapItem, QStyleOptionGraphicsItem
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
 from PyQt5.QtGui import QPixmap, QPainter, QPainterPath
-from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtCore import Qt, QPoint, QPointF, QRect, QRectF, QTimer
 
 
 # Constants
 SCALE_FACTOR = 5
 WIDTH = 20
 HEIGHT = 20
+# How long to wait (ms) after the magnifying glass is marked dirty before
+# rendering it, so that several changes (e.g. mouse movements) in one frame
+# are rendered once
+RENDER_DELAY = 16
 
 
 # Classes
-class MagnifyingGlass(QGraphicsPixmapItem):
-    def __init__(self, parent, video_widget):
+class MagnifyingGlass(QGraphicsItem):
+    # The magnifying glass is only rendered when something it shows has
+    # changed (the mouse has moved or the frame has changed), rather than
+    # periodically, so it uses no CPU while the video is idle
+    def __init__(self, parent, video_widget, video_player):
         super().__init__(parent)
 
         self._video_widget = video_widget
+        self._video_player = video_player
+        self._video_player.add_frame_listener(self.frame_changed)
 
         self._x, self._y = 0, 0
 
-        ellipse_rect = QRectF(0, 0, WIDTH * SCALE_FACTOR, HEIGHT * SCALE_FACTOR)
+        self._rect = QRectF(0, 0, WIDTH * SCALE_FACTOR, HEIGHT * SCALE_FACTOR)
         self._path = QPainterPath()
-        self._path.addEllipse(ellipse_rect)
+        self._path.addEllipse(self._rect)
+
+        # The image is rendered into the same pixmap each time
+        self._pixmap = QPixmap(WIDTH * SCALE_FACTOR, HEIGHT * SCALE_FACTOR)
+        self._pixmap.fill(Qt.transparent)
+
+        self._dirty = False
+        self._render_timer = QTimer()
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(RENDER_DELAY)
+        self._render_timer.timeout.connect(self.update_image)
+
+    def boundingRect(self):
+        return self._rect
+
+    def paint(self, painter, option, widget=None):
+        painter.drawPixmap(0, 0, self._pixmap)
+
+    def itemChange(self, change, value):
+        if change == QGraphicsItem.ItemVisibleHasChanged and value:
+            # Changes weren't rendered while it was hidden
+            self.mark_dirty()
+        return super().itemChange(change, value)
+
+    def mark_dirty(self):
+        """
+        Marks the image as out of date, so that it is rendered shortly (once,
+        however many times it is marked dirty before then).
+        """
+        self._dirty = True
+
+        if self.isVisible() and not self._render_timer.isActive():
+            self._render_timer.start()
 
     def update_image(self):
         """
-        Updates the image that the magnifying glass displays.
+        Updates the image that the magnifying glass displays, if it is out of
+        date.
         """
-        pixmap = QPixmap(WIDTH * SCALE_FACTOR, HEIGHT * SCALE_FACTOR)
-        pixmap.fill(Qt.transparent)
+        if not self._dirty or not self.isVisible():
+            return
 
-        painter = QPainter(pixmap)
+        self._dirty = False
+
+        self._pixmap.fill(Qt.transparent)
+
+        painter = QPainter(self._pixmap)
         painter.setClipPath(self._path, Qt.IntersectClip)
-        painter.scale(SCALE_FACTOR, SCALE_FACTOR)
-        painter.translate(-self._x, -self._y)
-        self._video_widget.paint(painter, QStyleOptionGraphicsItem())
-        self.setPixmap(pixmap)
+        if not self._paint_frame_crop(painter):
+            # Fall back to painting the (scaled) video widget
+            painter.scale(SCALE_FACTOR, SCALE_FACTOR)
+            painter.translate(-self._x, -self._y)
+            self._video_widget.paint(painter, QStyleOptionGraphicsItem())
         painter.end()
 
+        self.update()
+
+    def _paint_frame_crop(self, painter):
+        """
+        Paints the magnified region straight from the latest decoded frame, at
+        its native resolution, upscaling just that region.
+
+        :param painter: The QPainter to paint the pixmap with.
+        :return: Whether the region could be painted from the frame.
+        """
+        frame_size = self._video_player.get_latest_frame_size()
+        video_rect = self._video_widget.boundingRect()
+
+        if frame_size is None or video_rect.isEmpty():
+            return False
+
+        # The magnified region, in the frame's pixels
+        x_scale = frame_size.width() / video_rect.width()
+        y_scale = frame_size.height() / video_rect.height()
+        corner = self._video_widget.mapFromScene(QPointF(self._x, self._y)) \
+            - video_rect.topLeft()
+        source = QRectF(corner.x() * x_scale, corner.y() * y_scale,
+                        WIDTH * x_scale, HEIGHT * y_scale)
+
+        crop_rect = source.toAlignedRect().intersected(
+            QRect(QPoint(0, 0), frame_size))
+        if crop_rect.isEmpty():
+            return True  # None of the video is magnified
+
+        crop = self._video_player.crop_latest_frame(crop_rect)
+        if crop is None:
+            return False
+
+        # Nearest neighbour scaling, so that each of the frame's pixels is
+        # shown as a square
+        target = QRectF(
+            (crop_rect.x() - source.x()) / x_scale * SCALE_FACTOR,
+            (crop_rect.y() - source.y()) / y_scale * SCALE_FACTOR,
+            crop_rect.width() / x_scale * SCALE_FACTOR,
+            crop_rect.height() / y_scale * SCALE_FACTOR)
+        painter.drawImage(target, crop)
+
+        return True
+
+    def frame_changed(self):
+        """
+        Marks the image as out of date, as the video's frame has changed.
+        """
+        self.mark_dirty()
+
     def mouse_move(self, event):
         """
-        Updates the position and the image of the magnifying glass.
+        Updates the position of the magnifying glass, and marks its image as
+        out of date.
 
         :param event: The QEvent that contains the position of
         the mouse movement.
@@ -52,7 +150,7 @@ class MagnifyingGlass(QGraphicsPixmapItem):
 
         self._x, self._y = x - WIDTH/2, y - WIDTH/2
 
-        self.update_image()
+        self.mark_dirty()
 
         self.setPos(QPointF(x - width/2, y - height/2))
 
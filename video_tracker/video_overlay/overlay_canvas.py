@@ -1,19 +1,17 @@
 # Imports
-from PyQt5.QtWidgets import QGraphicsItemGroup, QGraphicsLineItem
-from PyQt5.QtGui import QPen
+from PyQt5.QtWidgets import QGraphicsItemGroup
 from PyQt5.QtCore import QPointF
 
 try:
     from video_overlay.reference_axes import ReferenceAxes
     from video_overlay.ruler import Ruler
     from video_overlay.magnifying_glass import MagnifyingGlass
+    from video_overlay.tracked_points import TrackedPoints
 except ImportError:
     from reference_axes import ReferenceAxes
     from ruler import Ruler
     from magnifying_glass import MagnifyingGlass
-
-# Constants
-CROSS_LENGTH = 10
+    from tracked_points import TrackedPoints
 
 
 # Classes
@@ -22,7 +20,8 @@ class OverlayCanvas(QGraphicsItemGroup):
         super().__init__()
 
         self._magnifying_glass = MagnifyingGlass(
-            self, video_controller.get_video_widget())
+            self, video_controller.get_video_widget(),
+            video_controller.get_video_player())
         self._magnifying_glass.setZValue(1)
 
         self._reference_axes = ReferenceAxes(self)
@@ -33,7 +32,7 @@ class OverlayCanvas(QGraphicsItemGroup):
         self._ruler = Ruler(self)
         self._ruler.setZValue(2)
 
-        self._points = []
+        self._points = {}  # Object name -> TrackedPoints
 
     def get_reference_axes(self):
         """
@@ -53,32 +52,37 @@ class OverlayCanvas(QGraphicsItemGroup):
         """
         return self._magnifying_glass
 
-    def clear_points(self):
+    def draw_points(self, name, points, colour):
+        """
+        Draws the points of an object with the given colour, replacing any
+        of its points that were previously drawn.
+
+        :param name: The name of the object.
+        :param points: An iterable of the (x, y) positions of the points (px)
+        :param colour: The colour to draw with (QColor)
         """
-        Clears all of the points that are currently being displayed.
+        if name not in self._points:
+            self._points[name] = TrackedPoints(self, colour)
+
+        self._points[name].set_colour(colour)
+        self._points[name].set_points(points)
+
+    def remove_points(self, name):
         """
-        for point in self._points:
-            for line in point:
-                line.scene().removeItem(line)
-                self.removeFromGroup(line)
-        self._points = []
+        Removes the drawn points of an object.
 
-    def draw_point(self, x, y, colour):
+        :param name: The name of the object.
         """
-        Draws a point at the specified position with the given colour.
+        if name in self._points:
+            item = self._points.pop(name)
+            item.scene().removeItem(item)
 
-        :param x: The x position of the point (px)
-        :param y: The y position of the point (px)
-        :param colour: The colour to draw with (QColor)
+    def rename_points(self, old_name, new_name):
+        """
+        Keeps the drawn points of a renamed object under its new name.
         """
-        pen = QPen(colour)
-        vertical_line = QGraphicsLineItem(x, y - CROSS_LENGTH,
-                                          x, y + CROSS_LENGTH, self)
-        vertical_line.setPen(pen)
-        horizontal_line = QGraphicsLineItem(x - CROSS_LENGTH, y,
-                                            x + CROSS_LENGTH, y, self)
-        horizontal_line.setPen(pen)
-        self._points.append((vertical_line, horizontal_line))
+        if old_name in self._points:
+            self._points[new_name] = self._points.pop(old_name)
 
     def set_ruler_visibility(self, visibility):
         """
@@ -35,6 +35,8 @@ class OverlayController:
         self._auto_increment = False
         self._toolbar = None
 
+        self._calibration_version = 0
+
     def get_magnifying_glass(self):
         """
         Returns the magnifying glass.
@@ -59,14 +61,35 @@ class OverlayController:
         Sets the reference angle of the axes to the specified angle (deg).
         """
         self._reference_axes.set_reference_angle(angle)
+        self._calibration_changed()
 
     def update_reference_angle(self, angle):
         """
         Updates the reference angle in the toolbar to the specified angle (deg).
         """
+        self._calibration_changed(True)
         if self._toolbar is not None:
             self._toolbar.update_reference_angle(angle)
 
+    def _calibration_changed(self, preview=False):
+        """
+        Records that the ruler or reference axes may have changed, and
+        updates the object controller.
+
+        :param preview: Whether the change is part of a drag, which is
+        followed by a final change when the mouse is released.
+        """
+        self._calibration_version += 1
+        if self._object_controller is not None:
+            self._object_controller.calibration_changed(preview)
+
+    def get_calibration_version(self):
+        """
+        Returns a number that changes whenever the ruler or reference axes
+        (and therefore the conversion from pixels) change.
+        """
+        return self._calibration_version
+
     def register_toolbar(self, toolbar):
         """
         Registers the given toolbar.
@@ -86,7 +109,7 @@ class OverlayController:
     def _mouse_press(self, event):
         """
         Pass the mouse press down to any overlay items that are there,
-        or otherwise tracks the current point.
+        or otherwise tracks (or with a right click, removes) the current point.
         """
 
         if not self._video_controller.is_video_imported():
@@ -99,18 +122,20 @@ class OverlayController:
         if not anything_done and event.button() == Qt.LeftButton and \
                 self._object_controller is not None and \
                 self._video_controller.is_video_imported():
-            # Track the object
+            # Track the object (the overlay is updated along with the rest of
+            # the views, once the video has been incremented)
             self._object_controller.track_current_object(event.scenePos().x(), event.scenePos().y())
 
-            # Update the overlay
-            self.update()
-
             # Increment the video if applicable
             if self._auto_increment:
                 self._video_controller.increment_position()
+        elif not anything_done and event.button() == Qt.RightButton and \
+                self._object_controller is not None:
+            # Remove the object's point at this frame
+            self._object_controller.untrack_current_object()
 
         if anything_done:
-            self.update(False)
+            self._calibration_changed()
 
     def _mouse_move(self, event):
         """
@@ -125,7 +150,7 @@ class OverlayController:
             anything_done |= item.mouse_move(event)
 
         if anything_done:
-            self.update(False)
+            self._calibration_changed(True)
 
     def _mouse_release(self, event):
         """
@@ -140,7 +165,7 @@ class OverlayController:
             anything_done |= item.mouse_release(event)
 
         if anything_done:
-            self.update(False)
+            self._calibration_changed()
 
     def get_ruler_length(self):
         """
@@ -157,7 +182,8 @@ class OverlayController:
 
     def _display_object_points(self):
         """
-        Displays the recent points of the objects on the overlay.
+        Displays the points of the objects around the current frame on the
+        overlay.
         """
         if self._object_controller is not None:
             object_points = self._object_controller.get_points_to_display()
@@ -165,22 +191,34 @@ class OverlayController:
             colour = QColor()
             colour.setRgb(255, 0, 0)
 
-            self._overlay_canvas.clear_points()
             for object in object_points:
-                for point_id, point in object['points'].items():
-                    self._overlay_canvas.draw_point(*point, colour)
+                self._overlay_canvas.draw_points(
+                    object['name'], object['points'].values(), colour)
 
-    def update(self, redisplay_points=True):
+    def object_added(self, name):
+        """
+        The points of new objects are drawn when they are next displayed.
         """
-        Redisplays the points and updates the object controller.
 
-        :param redisplay_points: Whether to redisplay the points.
+    def object_removed(self, name):
+        """
+        Removes the points of an object that was removed.
         """
-        if redisplay_points:
-            self._display_object_points()
+        self._overlay_canvas.remove_points(name)
 
-        if self._object_controller is not None:
-            self._object_controller.update()
+    def object_renamed(self, old_name, new_name):
+        """
+        Keeps the points of an object that was renamed.
+        """
+        self._overlay_canvas.rename_points(old_name, new_name)
+
+    def position_changed(self):
+        """
+        Redisplays the points around the new position in the video, and the
+        magnifying glass.
+        """
+        self._magnifying_glass.frame_changed()
+        self._display_object_points()
 
     def set_ruler_visibility(self, visibility):
         """
@@ -213,7 +251,8 @@ class OverlayController:
         self._ruler.load(data['ruler'])
         self._magnifying_glass.load(data['magnifying_glass'])
         self.set_auto_increment(data['auto_increment'])
-        self.update()
+        self._calibration_changed()
+        self._display_object_points()
         # TODO: Might have to update the toolbar
 
     def dump(self):
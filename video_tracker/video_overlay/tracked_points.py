@@ -0,0 +1,81 @@
+# Imports
+from PyQt5.QtWidgets import QGraphicsItem
+from PyQt5.QtGui import QPen
+from PyQt5.QtCore import QLineF, QRectF
+
+# Constants
+CROSS_LENGTH = 10
+
+
+# Classes
+class TrackedPoints(QGraphicsItem):
+    # Draws all of the displayed points of one object as crosses
+    def __init__(self, parent, colour):
+        super().__init__(parent)
+
+        self._pen = QPen(colour)
+
+        # Two lines per cross, which are reused between updates
+        self._lines = []
+        self._num_lines = 0
+
+        self._bounding_rect = QRectF()
+
+    def set_colour(self, colour):
+        """
+        Sets the colour that the crosses are drawn with.
+
+        :param colour: The colour to draw with (QColor)
+        """
+        if self._pen.color() != colour:
+            self._pen.setColor(colour)
+            self.update()
+
+    def set_points(self, points):
+        """
+        Sets the points to draw, replacing the previous ones.
+
+        :param points: An iterable of the (x, y) positions (px) of the points.
+        """
+        num_lines = 0
+        min_x = min_y = float('inf')
+        max_x = max_y = float('-inf')
+
+        for x, y in points:
+            if num_lines + 2 > len(self._lines):
+                self._lines.extend((QLineF(), QLineF()))
+
+            self._lines[num_lines].setLine(x, y - CROSS_LENGTH,
+                                           x, y + CROSS_LENGTH)
+            self._lines[num_lines + 1].setLine(x - CROSS_LENGTH, y,
+                                               x + CROSS_LENGTH, y)
+            num_lines += 2
+
+            min_x, max_x = min(min_x, x), max(max_x, x)
+            min_y, max_y = min(min_y, y), max(max_y, y)
+
+        self.prepareGeometryChange()
+        self._num_lines = num_lines
+
+        if num_lines == 0:
+            self._bounding_rect = QRectF()
+        else:
+            margin = CROSS_LENGTH + self._pen.widthF()
+            self._bounding_rect = QRectF(min_x, min_y, max_x - min_x,
+                                         max_y - min_y).adjusted(
+                -margin, -margin, margin, margin)
+
+        self.update()
+
+    def boundingRect(self):
+        return self._bounding_rect
+
+    def paint(self, painter, option, widget=None):
+        """
+        Draws all of the crosses with a single call.
+        """
+        if self._num_lines == 0:
+            return
+
+        painter.setPen(self._pen)
+        painter.drawLines(self._lines[:self._num_lines])